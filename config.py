@@ -4,8 +4,7 @@ Pixel Art Transformer - Configuration
 Centralized configuration for all constants, thresholds, and settings.
 """
 
-from dataclasses import dataclass
-from typing import Tuple
+from typing import NamedTuple, Tuple
 import logging
 
 
@@ -18,8 +17,17 @@ LOG_LEVEL = logging.INFO
 
 
 def setup_logging(level: int = LOG_LEVEL) -> logging.Logger:
-    """Configure and return the application logger."""
-    logging.basicConfig(format=LOG_FORMAT, level=level)
+    """
+    Configure and return the application logger.
+    
+    Meant to be called once by an entry point. If logging is already
+    configured, only the level is updated so handlers are not duplicated.
+    """
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(format=LOG_FORMAT, level=level)
+    else:
+        root.setLevel(level)
     return logging.getLogger("PixelArtTransformer")
 
 
@@ -27,8 +35,7 @@ def setup_logging(level: int = LOG_LEVEL) -> logging.Logger:
 # UI COLORS
 # =============================================================================
 
-@dataclass(frozen=True)
-class UIColors:
+class UIColors(NamedTuple):
     """Color scheme for the application UI."""
     background: str = "#1a1a2e"
     foreground: str = "#eaeaea"
@@ -53,8 +60,7 @@ UI_COLORS = UIColors()
 # ZOOM SETTINGS
 # =============================================================================
 
-@dataclass(frozen=True)
-class ZoomSettings:
+class ZoomSettings(NamedTuple):
     """Zoom configuration for canvases."""
     default: float = 1.0
     min_level: float = 0.1
@@ -73,13 +79,11 @@ ZOOM = ZoomSettings()
 # GRID DETECTION
 # =============================================================================
 
-@dataclass(frozen=True)
-class GridDetectionSettings:
+class GridDetectionSettings(NamedTuple):
     """Settings for automatic grid size detection."""
     # Common pixel art sizes, ordered largest to smallest
     common_sizes: Tuple[int, ...] = (64, 48, 32, 24, 16, 12, 10, 8, 6, 5, 4, 3, 2)
     max_check_size: int = 128
-    max_samples: int = 100
     uniformity_threshold: float = 0.95  # Percentage of uniform blocks required
     uniformity_threshold_gui: float = 0.90  # Slightly lower for GUI preview
     min_pixel_size: int = 2
@@ -92,8 +96,7 @@ GRID_DETECTION = GridDetectionSettings()
 # REGION SELECTION
 # =============================================================================
 
-@dataclass(frozen=True)
-class RegionSettings:
+class RegionSettings(NamedTuple):
     """Settings for region selection."""
     min_region_size: int = 10  # Minimum pixels for a valid region
     default_grid_size: int = 32
@@ -102,6 +105,7 @@ class RegionSettings:
     offset_range: Tuple[int, int] = (-32, 32)
     tolerance_range: Tuple[int, int] = (0, 50)
     default_tolerance: int = 10
+    input_debounce_ms: int = 100  # Delay before slider changes reach the canvas
 
 
 REGION = RegionSettings()
@@ -111,8 +115,7 @@ REGION = RegionSettings()
 # COLOR PROCESSING
 # =============================================================================
 
-@dataclass(frozen=True)
-class ColorSettings:
+class ColorSettings(NamedTuple):
     """Settings for color processing."""
     bit_depth_options: Tuple[Tuple[str, int], ...] = (
         ("8-bit", 8),
@@ -131,8 +134,7 @@ COLOR = ColorSettings()
 # WINDOW SETTINGS
 # =============================================================================
 
-@dataclass(frozen=True)
-class WindowSettings:
+class WindowSettings(NamedTuple):
     """Window configuration."""
     default_geometry: str = "1280x720"
     min_width: int = 1024
@@ -148,8 +150,7 @@ WINDOW = WindowSettings()
 # FILE SETTINGS
 # =============================================================================
 
-@dataclass(frozen=True)
-class FileSettings:
+class FileSettings(NamedTuple):
     """File handling configuration."""
     supported_formats: Tuple[Tuple[str, str], ...] = (
         ("Imágenes", "*.png *.jpg *.jpeg *.gif *.bmp *.webp"),
@@ -184,8 +185,7 @@ FILE = FileSettings()
 # GRID EDITOR SETTINGS
 # =============================================================================
 
-@dataclass(frozen=True)
-class GridEditorSettings:
+class GridEditorSettings(NamedTuple):
     """Settings for the advanced grid editor."""
     # Distance in screen pixels to detect line for dragging
     line_grab_distance: int = 8
@@ -202,10 +202,15 @@ class GridEditorSettings:
     cell_excluded_overlay: Tuple[int, int, int, int] = (255, 80, 80, 120)
     cell_included_overlay: Tuple[int, int, int, int] = (80, 255, 80, 80)
     cell_hover_overlay: Tuple[int, int, int, int] = (255, 255, 100, 60)
+    cell_area_overlay: Tuple[int, int, int, int] = (0, 170, 255, 110)
+    cell_contour_overlay: Tuple[int, int, int, int] = (255, 0, 255, 110)
     
     # Line width
     line_width_normal: int = 1
     line_width_hover: int = 3
+    
+    # Hide cell center markers when cells are narrower than this on screen
+    min_marker_cell_px: int = 4
 
 
 GRID_EDITOR = GridEditorSettings()
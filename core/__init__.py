@@ -2,39 +2,79 @@
 Pixel Art Transformer - Core Package
 =====================================
 Core image processing functionality, separated from GUI.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+`core.exceptions` alone does not pull in NumPy and Pillow. Set the
+environment variable EAGER_IMPORT=1 to import everything up front.
 """
 
-from .transformer import (
-    detect_pixel_size,
-    transform_to_real_pixels,
-    transform_with_custom_grid,
-    create_grid_visualization,
-    reduce_color,
-    colors_similar,
-    get_center_color,
-    draw_grid_overlay,
-)
-
-from .exceptions import (
-    PixelArtError,
-    InvalidImageError,
-    GridDetectionError,
-    ProcessingError,
-)
-
-__all__ = [
+from __future__ import annotations
+
+import importlib
+import os
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .transformer import (
+        detect_pixel_size,
+        transform_to_real_pixels,
+        transform_with_custom_grid,
+        create_grid_visualization,
+        reduce_color,
+        reduce_color_array,
+        colors_similar,
+        colors_similar_mask,
+        get_center_color,
+        draw_grid_overlay,
+        invalidate_image_cache,
+    )
+    from .exceptions import (
+        PixelArtError,
+        InvalidImageError,
+        GridDetectionError,
+        ProcessingError,
+    )
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS: dict[str, str] = {
     # Transformer functions
-    "detect_pixel_size",
-    "transform_to_real_pixels",
-    "transform_with_custom_grid",
-    "create_grid_visualization",
-    "reduce_color",
-    "colors_similar",
-    "get_center_color",
-    "draw_grid_overlay",
+    "detect_pixel_size": "transformer",
+    "transform_to_real_pixels": "transformer",
+    "transform_with_custom_grid": "transformer",
+    "create_grid_visualization": "transformer",
+    "reduce_color": "transformer",
+    "reduce_color_array": "transformer",
+    "colors_similar": "transformer",
+    "colors_similar_mask": "transformer",
+    "get_center_color": "transformer",
+    "draw_grid_overlay": "transformer",
+    "invalidate_image_cache": "transformer",
     # Exceptions
-    "PixelArtError",
-    "InvalidImageError",
-    "GridDetectionError",
-    "ProcessingError",
-]
+    "PixelArtError": "exceptions",
+    "InvalidImageError": "exceptions",
+    "GridDetectionError": "exceptions",
+    "ProcessingError": "exceptions",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining `name` on first access."""
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value  # Skip __getattr__ on later lookups
+    return value
+
+
+def __dir__() -> list[str]:
+    """List lazily imported names alongside the module globals."""
+    return sorted(set(globals()) | set(__all__))
+
+
+if os.environ.get("EAGER_IMPORT"):
+    for _name in __all__:
+        __getattr__(_name)
@@ -7,18 +7,22 @@ Unified image processing functions with type hints and documentation.
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import math
+import zlib
+from functools import lru_cache, reduce
+from typing import TYPE_CHECKING, Callable
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from PIL import Image, ImageDraw
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-from config import GRID_DETECTION, setup_logging
+from config import GRID_DETECTION
 
-# Module logger
-logger = setup_logging()
+# Module logger (configured by the application entry point)
+logger = logging.getLogger("PixelArtTransformer.transformer")
 
 
 # =============================================================================
@@ -30,6 +34,89 @@ ColorRGBA = tuple[int, int, int, int]
 Coords = tuple[int, int, int, int]
 
 
+# =============================================================================
+# IMAGE ARRAY CACHE
+# =============================================================================
+
+# Arrays derived from an image are cached on the image itself, so they are
+# freed together with it (PIL images are unhashable, which rules out a
+# WeakKeyDictionary). PIL images have no version counter; each lookup checks
+# the size, mode and a checksum of a sparse pixel sample instead, so in-place
+# edits that touch sampled pixels drop the cache. Call invalidate_image_cache
+# after editing an image in place to be sure.
+_CACHE_ATTR = '_pixel_art_array_cache'
+_ARRAY_CACHE_SIZE = 8  # Arrays kept per image
+_FINGERPRINT_SAMPLES = 32  # Sampled pixels per axis
+
+
+def _image_fingerprint(image: Image.Image) -> tuple:
+    """Get a cheap key for an image's current contents from a pixel sample."""
+    width, height = image.size
+    sample = image.resize(
+        (min(width, _FINGERPRINT_SAMPLES), min(height, _FINGERPRINT_SAMPLES)),
+        Image.Resampling.NEAREST
+    )
+    return (image.size, image.mode, zlib.crc32(sample.tobytes()))
+
+
+def invalidate_image_cache(image: Image.Image) -> None:
+    """
+    Drop the arrays cached for an image.
+    
+    Call this after editing an image in place (paste, putpixel, ...) so
+    the next call recomputes them from the new pixels.
+    
+    Args:
+        image: Image whose cached arrays should be discarded.
+    """
+    image.__dict__.pop(_CACHE_ATTR, None)
+
+
+def _cached_for_image(
+    image: Image.Image,
+    key: tuple,
+    compute: Callable[[], NDArray]
+) -> NDArray:
+    """
+    Return a cached array derived from an image, computing it if needed.
+    
+    Args:
+        image: Image the array is derived from.
+        key: Extra parameters the array depends on.
+        compute: Function producing the array on a cache miss.
+    
+    Returns:
+        The cached or freshly computed array.
+    """
+    fingerprint = _image_fingerprint(image)
+    cache = image.__dict__.get(_CACHE_ATTR)
+    if cache is None or cache[0] != fingerprint:
+        cache = (fingerprint, {})
+        setattr(image, _CACHE_ATTR, cache)
+    
+    arrays: dict[tuple, NDArray] = cache[1]
+    result = arrays.get(key)
+    if result is not None:
+        return result
+    
+    result = compute()
+    result.flags.writeable = False  # Shared between callers
+    if len(arrays) >= _ARRAY_CACHE_SIZE:
+        arrays.pop(next(iter(arrays)))
+    arrays[key] = result
+    return result
+
+
+def _rgb_array(image: Image.Image) -> NDArray[np.uint8]:
+    """Get the image as an (H, W, 3) RGB array, converting it only once."""
+    return _cached_for_image(image, ('rgb',), lambda: np.asarray(image.convert('RGB')))
+
+
+def _packed_rgb_array(image: Image.Image) -> NDArray[np.uint32]:
+    """Get the image as an (H, W) array with RGB packed into one uint32."""
+    return _cached_for_image(image, ('packed',), lambda: _pack_rgb(_rgb_array(image)))
+
+
 # =============================================================================
 # COLOR PROCESSING
 # =============================================================================
@@ -48,6 +135,9 @@ def reduce_color(color: Color | ColorRGBA, bits: int) -> Color:
     Returns:
         Quantized RGB tuple.
     
+    Raises:
+        ValueError: If bits is less than 1.
+    
     Examples:
         >>> reduce_color((200, 100, 50), 4)  # 16 levels per channel
         (200, 104, 56)
@@ -57,13 +147,42 @@ def reduce_color(color: Color | ColorRGBA, bits: int) -> Color:
     if bits >= 8:
         return color[:3]  # type: ignore
     
-    levels = 2 ** bits
-    factor = 256 // levels
+    lut = _REDUCE_LUT.get(bits)
+    if lut is None:
+        raise ValueError(f"Bit depth must be at least 1, got {bits}")
+    
+    return (lut[color[0]], lut[color[1]], lut[color[2]])
+
+
+def reduce_color_array(arr: NDArray[np.uint8], bits: int) -> NDArray[np.uint8]:
+    """
+    Reduce every value of a uint8 array to a specified bit depth.
+    
+    Vectorized equivalent of `reduce_color`, applied to all channels
+    of the given array at once.
+    
+    Args:
+        arr: uint8 array of channel values (e.g. shape (H, W, 3)).
+        bits: Target bit depth (1-8). 8 returns the array unchanged.
+    
+    Returns:
+        Quantized uint8 array with the same shape.
+    """
+    if bits >= 8:
+        return arr
+    
+    factor = 1 << (8 - bits)
+    mask = np.uint8(0xFF & ~(factor - 1))
     
-    return tuple(
-        min(255, (c // factor) * factor + factor // 2) 
-        for c in color[:3]
-    )  # type: ignore
+    return (arr & mask) | np.uint8(factor >> 1)
+
+
+# Per-channel lookup tables (bits -> 256 quantized values) for scalar paths.
+# Stored as tuples of Python ints so indexing avoids NumPy scalar overhead.
+_REDUCE_LUT: dict[int, tuple[int, ...]] = {
+    bits: tuple(reduce_color_array(np.arange(256, dtype=np.uint8), bits).tolist())
+    for bits in range(1, 9)
+}
 
 
 def colors_similar(c1: Color, c2: Color, tolerance: int) -> bool:
@@ -89,12 +208,59 @@ def colors_similar(c1: Color, c2: Color, tolerance: int) -> bool:
     return all(abs(a - b) <= tolerance for a, b in zip(c1, c2))
 
 
-def get_center_color(image: Image.Image, x: int, y: int, cell_size: int) -> ColorRGBA:
+def colors_similar_mask(
+    pixels: NDArray[np.uint8],
+    colors: list[Color | None] | None,
+    tolerance: int
+) -> NDArray[np.bool_]:
+    """
+    Check which pixels are similar to any of the given colors.
+    
+    Vectorized equivalent of `colors_similar`, broadcast over every
+    pixel and every color at once.
+    
+    Args:
+        pixels: Array of shape (..., 3) or (..., 4); only RGB is compared.
+        colors: RGB colors to match against. None entries are ignored.
+        tolerance: Maximum difference allowed per channel.
+    
+    Returns:
+        Boolean array of shape pixels.shape[:-1].
+    """
+    valid = [c[:3] for c in (colors or []) if c is not None]
+    if not valid:
+        return np.zeros(pixels.shape[:-1], dtype=bool)
+    
+    if tolerance == 0:
+        # Exact match: compare one packed value per pixel instead of three
+        return np.isin(_pack_rgb(pixels), _pack_rgb(np.asarray(valid, dtype=np.uint8)))
+    
+    colors_arr = np.asarray(valid, dtype=np.int16)
+    diff = np.abs(pixels[..., None, :3].astype(np.int16) - colors_arr)
+    return (diff <= tolerance).all(axis=-1).any(axis=-1)
+
+
+def _pack_rgb(pixels: NDArray[np.uint8]) -> NDArray[np.uint32]:
+    """Pack the RGB channels of an (..., 3|4) array into one uint32 per pixel."""
+    return (
+        pixels[..., 0].astype(np.uint32)
+        | (pixels[..., 1].astype(np.uint32) << 8)
+        | (pixels[..., 2].astype(np.uint32) << 16)
+    )
+
+
+def get_center_color(
+    image: Image.Image | NDArray[np.uint8],
+    x: int,
+    y: int,
+    cell_size: int
+) -> ColorRGBA:
     """
     Get the color at the center of a grid cell.
     
     Args:
-        image: PIL Image to sample from.
+        image: PIL Image to sample from, or an (H, W, 3|4) array of it.
+            Passing the array avoids a PIL call per sample in loops.
         x: Left coordinate of the cell.
         y: Top coordinate of the cell.
         cell_size: Size of the grid cell.
@@ -102,10 +268,18 @@ def get_center_color(image: Image.Image, x: int, y: int, cell_size: int) -> Colo
     Returns:
         RGBA color tuple at the cell center.
     """
-    center_x = min(x + cell_size // 2, image.width - 1)
-    center_y = min(y + cell_size // 2, image.height - 1)
+    if isinstance(image, np.ndarray):
+        height, width = image.shape[:2]
+    else:
+        width, height = image.size
+    
+    center_x = min(x + cell_size // 2, width - 1)
+    center_y = min(y + cell_size // 2, height - 1)
     
-    color = image.getpixel((center_x, center_y))
+    if isinstance(image, np.ndarray):
+        color = tuple(image[center_y, center_x].tolist())
+    else:
+        color = image.getpixel((center_x, center_y))
     
     # Ensure RGBA format
     if len(color) == 3:
@@ -113,10 +287,121 @@ def get_center_color(image: Image.Image, x: int, y: int, cell_size: int) -> Colo
     return color
 
 
+def _sample_rgba(
+    image: Image.Image,
+    index: tuple[NDArray[np.intp] | slice, NDArray[np.intp] | slice]
+) -> NDArray[np.uint8]:
+    """
+    Sample pixels of an image as RGBA.
+    
+    RGBA and RGB images are sampled directly; only other modes (palette,
+    grayscale, ...) pay for a full-image conversion.
+    
+    Args:
+        image: Source image.
+        index: (rows, cols) index applied to the (H, W, C) image array,
+            either broadcastable position arrays or slices.
+    
+    Returns:
+        Array of shape (rows, cols, 4).
+    """
+    if image.mode not in ('RGBA', 'RGB'):
+        image = image.convert('RGBA')
+    
+    sampled = np.asarray(image)[index]
+    
+    # Synthesize opaque alpha for RGB sources
+    if sampled.shape[-1] == 3:
+        alpha = np.full(sampled.shape[:2] + (1,), 255, dtype=np.uint8)
+        sampled = np.concatenate((sampled, alpha), axis=-1)
+    
+    return sampled
+
+
+def _process_samples(
+    sampled: NDArray[np.uint8],
+    bit_depth: int,
+    excluded_colors: list[Color | None] | None,
+    tolerance: int
+) -> NDArray[np.uint8]:
+    """
+    Apply color reduction and color exclusion to sampled RGBA pixels.
+    
+    Vectorized equivalent of calling `reduce_color` and `colors_similar`
+    on every sampled pixel.
+    
+    Args:
+        sampled: Array of shape (H, W, 4) with the sampled RGBA pixels.
+        bit_depth: Color quantization (1-8 bits per channel).
+        excluded_colors: Colors to make transparent.
+        tolerance: Tolerance for color matching when excluding.
+    
+    Returns:
+        New uint8 array of shape (H, W, 4).
+    """
+    result = np.array(sampled, dtype=np.uint8)
+    
+    # Apply color reduction
+    result[..., :3] = reduce_color_array(result[..., :3], bit_depth)
+    
+    # Make excluded colors transparent
+    result[colors_similar_mask(result, excluded_colors, tolerance)] = 0
+    
+    return result
+
+
 # =============================================================================
 # GRID DETECTION
 # =============================================================================
 
+def _block_uniformity(packed: NDArray[np.uint32], size: int) -> float:
+    """
+    Compute the fraction of size×size blocks that are a single color.
+    
+    All blocks are checked at once through a zero-copy window view of
+    shape (blocks_y, blocks_x, size, size); partial blocks at the right
+    and bottom edges are skipped by the window stride.
+    
+    Args:
+        packed: Packed RGB image array of shape (H, W).
+        size: Block size in pixels.
+    
+    Returns:
+        Fraction (0-1) of uniform blocks, or 0 if no full block fits.
+    """
+    height, width = packed.shape
+    if height < size or width < size:
+        return 0.0
+    
+    blocks = sliding_window_view(packed, (size, size))[::size, ::size]
+    uniform = (blocks == blocks[:, :, :1, :1]).all(axis=(2, 3))
+    return float(uniform.mean())
+
+
+def _run_length_gcd(packed: NDArray[np.uint32]) -> int:
+    """
+    Estimate the pixel size from run lengths of the middle row and column.
+    
+    In upscaled pixel art every run of identical pixels spans a whole
+    number of pixels, so the GCD of the run lengths is a candidate size.
+    
+    Args:
+        packed: Packed RGB image array of shape (H, W).
+    
+    Returns:
+        GCD of all run lengths found.
+    """
+    height, width = packed.shape
+    run_lengths: list[int] = []
+    
+    for line in (packed[height // 2], packed[:, width // 2]):
+        boundaries = (line[1:] != line[:-1]).nonzero()[0] + 1
+        edges = np.concatenate(([0], boundaries, [len(line)]))
+        run_lengths.extend(np.diff(edges).tolist())
+    
+    return reduce(math.gcd, run_lengths)
+
+
 def detect_pixel_size(
     image: Image.Image, 
     max_check: int = GRID_DETECTION.max_check_size,
@@ -125,9 +410,11 @@ def detect_pixel_size(
     """
     Auto-detect the pixel/grid size of upscaled pixel art.
     
-    Analyzes the image for repeating uniform blocks. Prioritizes common
-    pixel art sizes (16, 32, etc.) and finds the largest size where
-    most blocks are uniform (single color).
+    Analyzes the image for repeating uniform blocks. The GCD of the run
+    lengths along the middle row and column is tried first, preferring any
+    common size that is a multiple of it; if it does not validate, common
+    pixel art sizes (16, 32, etc.) are prioritized to find the largest size
+    where most blocks are uniform (single color).
     
     Args:
         image: PIL Image to analyze.
@@ -140,13 +427,34 @@ def detect_pixel_size(
     Raises:
         ValueError: If image is too small to analyze.
     """
-    img_array = np.array(image.convert('RGB'))
     width, height = image.size
     
     if width < 2 or height < 2:
         logger.warning("Image too small for grid detection: %dx%d", width, height)
         return 1
     
+    packed = _packed_rgb_array(image)
+    
+    # Fast path: validate the run-length GCD before scanning all sizes
+    candidate = _run_length_gcd(packed)
+    if (
+        GRID_DETECTION.min_pixel_size <= candidate <= max_check
+        and width % candidate == 0 and height % candidate == 0
+        and _block_uniformity(packed, candidate) >= threshold
+    ):
+        # A few split blocks can pull the GCD below a common size that still
+        # passes the threshold; those keep their priority over the candidate
+        for size in GRID_DETECTION.common_sizes:
+            if (
+                candidate < size <= max_check and size % candidate == 0
+                and width % size == 0 and height % size == 0
+                and _block_uniformity(packed, size) >= threshold
+            ):
+                candidate = size
+                break
+        logger.info("Detected pixel size: %d", candidate)
+        return candidate
+    
     # Build list of sizes to check, prioritizing common ones
     all_sizes: list[int] = []
     for size in range(max_check, 1, -1):
@@ -167,38 +475,12 @@ def detect_pixel_size(
     best_size = 1
     
     for size in sizes_to_check:
-        blocks_x = width // size
-        blocks_y = height // size
-        total_blocks = blocks_x * blocks_y
-        
-        # Sample blocks (up to max_samples)
-        max_samples = min(GRID_DETECTION.max_samples, total_blocks)
-        step = max(1, total_blocks // max_samples)
-        
-        sample_count = 0
-        uniform_count = 0
-        
-        for i in range(0, total_blocks, step):
-            bx = (i % blocks_x) * size
-            by = (i // blocks_x) * size
-            
-            block = img_array[by:by+size, bx:bx+size]
-            
-            # Check if block is uniform (all pixels same color)
-            first_pixel = block[0, 0]
-            if np.all(block == first_pixel):
-                uniform_count += 1
-            
-            sample_count += 1
+        uniformity = _block_uniformity(packed, size)
+        logger.debug("Size %d: %.1f%% uniform", size, uniformity * 100)
         
-        # Check if enough blocks are uniform
-        if sample_count > 0:
-            uniformity = uniform_count / sample_count
-            logger.debug("Size %d: %.1f%% uniform", size, uniformity * 100)
-            
-            if uniformity >= threshold:
-                best_size = size
-                break
+        if uniformity >= threshold:
+            best_size = size
+            break
     
     logger.info("Detected pixel size: %d", best_size)
     return best_size
@@ -243,12 +525,6 @@ def transform_to_real_pixels(
     
     width, height = image.size
     
-    # Handle palette mode
-    if image.mode == 'P':
-        image = image.convert('RGBA')
-    elif image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
     # Calculate start positions
     start_x = offset_x if offset_x >= 0 else offset_x % cell_size
     start_y = offset_y if offset_y >= 0 else offset_y % cell_size
@@ -260,39 +536,33 @@ def transform_to_real_pixels(
     if new_width < 1 or new_height < 1:
         raise ValueError(f"Result would be empty: {new_width}x{new_height}")
     
-    # Create output image
-    result = Image.new('RGBA', (new_width, new_height), (0, 0, 0, 0))
-    
-    # Prepare excluded colors list
-    excluded: list[Color] = [c for c in (excluded_colors or []) if c is not None]
-    
-    # Process each cell
-    for py in range(new_height):
-        for px in range(new_width):
-            cx = start_x + px * cell_size + cell_size // 2
-            cy = start_y + py * cell_size + cell_size // 2
-            
-            # Ensure within bounds
-            cx = min(cx, width - 1)
-            cy = min(cy, height - 1)
-            
-            color = image.getpixel((cx, cy))
-            if len(color) == 3:
-                color = color + (255,)
-            
-            # Apply color reduction
-            rgb = reduce_color(color[:3], bit_depth)
-            
-            # Check if excluded
-            is_excluded = any(
-                colors_similar(rgb, exc, tolerance) 
-                for exc in excluded
-            )
-            
-            if is_excluded:
-                result.putpixel((px, py), (0, 0, 0, 0))
-            else:
-                result.putpixel((px, py), rgb + (color[3],))
+    has_exclusions = any(c is not None for c in excluded_colors or [])
+    
+    if bit_depth >= 8 and not has_exclusions:
+        # Fast path: plain downscale, nothing to reduce or exclude.
+        # NEAREST over the exact grid box picks each cell's center pixel,
+        # in Pillow's C resampler (AVX2-accelerated with Pillow-SIMD)
+        # and without copying the whole source into an array.
+        box = (
+            start_x, start_y,
+            start_x + new_width * cell_size, start_y + new_height * cell_size
+        )
+        result = image.resize(
+            (new_width, new_height), Image.Resampling.NEAREST, box=box
+        )
+        if result.mode != 'RGBA':
+            result = result.convert('RGBA')
+    else:
+        # Sample all cell centers at once. The last center is always inside
+        # the image, so the centers form a plain strided view of the source.
+        half = cell_size // 2
+        sampled = _sample_rgba(image, (
+            slice(start_y + half, start_y + half + new_height * cell_size, cell_size),
+            slice(start_x + half, start_x + half + new_width * cell_size, cell_size),
+        ))
+        result = Image.fromarray(
+            _process_samples(sampled, bit_depth, excluded_colors, tolerance)
+        )
     
     logger.info(
         "Transformed %dx%d -> %dx%d (cell_size=%d)",
@@ -309,7 +579,8 @@ def transform_with_custom_grid(
     excluded_cells: set[tuple[int, int]] | None = None,
     bit_depth: int = 8,
     excluded_colors: list[Color | None] | None = None,
-    tolerance: int = 10
+    tolerance: int = 10,
+    excluded_mask: np.ndarray | None = None
 ) -> Image.Image:
     """
     Transform image using custom grid line positions.
@@ -325,12 +596,15 @@ def transform_with_custom_grid(
         bit_depth: Color quantization (1-8 bits per channel).
         excluded_colors: Colors to make transparent.
         tolerance: Tolerance for color matching when excluding.
+        excluded_mask: Boolean (num_rows, num_cols) array of cells to make
+            transparent; an alternative to excluded_cells that avoids
+            building a set of tuples for large grids.
     
     Returns:
         New Image at true pixel dimensions with RGBA mode.
     
     Raises:
-        ValueError: If grid is invalid.
+        ValueError: If grid is invalid or excluded_mask has the wrong shape.
     """
     if len(x_lines) < 2 or len(y_lines) < 2:
         raise ValueError("Grid must have at least 2 lines in each direction")
@@ -341,57 +615,37 @@ def transform_with_custom_grid(
     if num_cols < 1 or num_rows < 1:
         raise ValueError(f"Grid too small: {num_cols}x{num_rows}")
     
-    # Handle palette mode
-    if image.mode == 'P':
-        image = image.convert('RGBA')
-    elif image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
     width, height = image.size
     
-    # Create output image
-    result = Image.new('RGBA', (num_cols, num_rows), (0, 0, 0, 0))
-    
-    # Prepare excluded colors list
-    excluded: list[Color] = [c for c in (excluded_colors or []) if c is not None]
-    excluded_cells = excluded_cells or set()
-    
-    # Process each cell
-    for row in range(num_rows):
-        for col in range(num_cols):
-            # Check if manually excluded
-            if (col, row) in excluded_cells:
-                result.putpixel((col, row), (0, 0, 0, 0))
-                continue
-            
-            # Calculate cell center
-            x1, x2 = x_lines[col], x_lines[col + 1]
-            y1, y2 = y_lines[row], y_lines[row + 1]
-            
-            cx = (x1 + x2) // 2
-            cy = (y1 + y2) // 2
-            
-            # Clamp to image bounds
-            cx = max(0, min(cx, width - 1))
-            cy = max(0, min(cy, height - 1))
-            
-            color = image.getpixel((cx, cy))
-            if len(color) == 3:
-                color = color + (255,)
-            
-            # Apply color reduction
-            rgb = reduce_color(color[:3], bit_depth)
-            
-            # Check if color-excluded
-            is_excluded = any(
-                colors_similar(rgb, exc, tolerance) 
-                for exc in excluded
+    # Calculate cell centers, clamped to image bounds. Column centers only
+    # depend on x_lines and row centers on y_lines, so even a non-uniform
+    # grid is sampled with a single outer-product gather.
+    xl = np.asarray(x_lines, dtype=np.intp)
+    yl = np.asarray(y_lines, dtype=np.intp)
+    xs = np.clip((xl[:-1] + xl[1:]) // 2, 0, width - 1)
+    ys = np.clip((yl[:-1] + yl[1:]) // 2, 0, height - 1)
+    
+    pixels = _process_samples(
+        _sample_rgba(image, (ys[:, None], xs[None, :])),
+        bit_depth, excluded_colors, tolerance
+    )
+    
+    # Clear manually excluded cells
+    if excluded_cells:
+        cells = np.array(list(excluded_cells), dtype=np.intp).reshape(-1, 2)
+        cols, rows = cells[:, 0], cells[:, 1]
+        valid = (cols >= 0) & (cols < num_cols) & (rows >= 0) & (rows < num_rows)
+        pixels[rows[valid], cols[valid]] = 0
+    
+    if excluded_mask is not None:
+        mask = np.asarray(excluded_mask, dtype=bool)
+        if mask.shape != (num_rows, num_cols):
+            raise ValueError(
+                f"excluded_mask shape {mask.shape} does not match grid {num_rows}x{num_cols}"
             )
-            
-            if is_excluded:
-                result.putpixel((col, row), (0, 0, 0, 0))
-            else:
-                result.putpixel((col, row), rgb + (color[3],))
+        pixels[mask] = 0
+    
+    result = Image.fromarray(pixels)
     
     logger.info(
         "Transformed with custom grid: %dx%d -> %dx%d",
@@ -405,6 +659,122 @@ def transform_with_custom_grid(
 # VISUALIZATION
 # =============================================================================
 
+def _quantized(image: Image.Image, bits: int) -> NDArray[np.uint8]:
+    """Get the image as an (H, W, 3) RGB array reduced to a bit depth."""
+    return _cached_for_image(
+        image, ('quantized', bits),
+        lambda: reduce_color_array(_rgb_array(image), bits)
+    )
+
+
+def _excluded_mask(
+    image: Image.Image,
+    bits: int,
+    excluded_colors: list[Color | None] | None,
+    tolerance: int
+) -> NDArray[np.bool_]:
+    """Get an (H, W) mask of pixels whose reduced color is excluded."""
+    excluded = tuple(sorted(tuple(c[:3]) for c in (excluded_colors or []) if c is not None))
+    return _cached_for_image(
+        image, ('excluded', bits, excluded, tolerance),
+        lambda: colors_similar_mask(_quantized(image, bits), list(excluded), tolerance)
+    )
+
+
+@lru_cache(maxsize=None)
+def _marker_offsets(shape: str, size: int) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """
+    Rasterize a center marker once and return its pixel offsets.
+    
+    Args:
+        shape: 'dot' for a filled ellipse, 'cross' for an X of width 2.
+        size: Marker radius in pixels.
+    
+    Returns:
+        Tuple of (dy, dx) offset arrays relative to the marker center.
+    """
+    center = size + 2
+    stamp = Image.new('L', (2 * center + 1, 2 * center + 1), 0)
+    draw = ImageDraw.Draw(stamp)
+    
+    if shape == 'dot':
+        draw.ellipse(
+            [(center - size, center - size), (center + size, center + size)],
+            fill=255
+        )
+    else:
+        draw.line(
+            [(center - size, center - size), (center + size, center + size)],
+            fill=255, width=2
+        )
+        draw.line(
+            [(center + size, center - size), (center - size, center + size)],
+            fill=255, width=2
+        )
+    
+    dy, dx = np.nonzero(np.asarray(stamp))
+    return dy - center, dx - center
+
+
+def _draw_lines(
+    overlay: NDArray[np.uint8],
+    cell_size: int,
+    offset_x: int,
+    offset_y: int,
+    color: ColorRGBA
+) -> None:
+    """Draw 1px grid lines into an RGBA overlay array in place."""
+    height, width = overlay.shape[:2]
+    xs = np.arange(offset_x, width, cell_size)
+    ys = np.arange(offset_y, height, cell_size)
+    overlay[:, xs[xs >= 0]] = color
+    overlay[ys[ys >= 0], :] = color
+
+
+def _draw_markers(
+    overlay: NDArray[np.uint8],
+    cx: NDArray[np.intp],
+    cy: NDArray[np.intp],
+    shape: str,
+    size: int,
+    color: ColorRGBA
+) -> None:
+    """Stamp a marker at every (cx, cy) center of an RGBA overlay array in place."""
+    height, width = overlay.shape[:2]
+    dy, dx = _marker_offsets(shape, size)
+    
+    # Every (center, stamp pixel) pair in one write; overlaps just repeat the color
+    ys = (cy[:, None] + dy).ravel()
+    xs = (cx[:, None] + dx).ravel()
+    valid = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+    overlay[ys[valid], xs[valid]] = color
+
+
+def _cell_centers(
+    width: int,
+    height: int,
+    cell_size: int,
+    offset_x: int,
+    offset_y: int
+) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """
+    Get the centers of all cells of a uniform grid that lie inside the image.
+    
+    Returns:
+        Tuple of flat (cx, cy) arrays, in row-major cell order.
+    """
+    start_x = offset_x if offset_x >= 0 else offset_x % cell_size
+    start_y = offset_y if offset_y >= 0 else offset_y % cell_size
+    
+    xs = np.arange(start_x, width, cell_size) + cell_size // 2
+    ys = np.arange(start_y, height, cell_size) + cell_size // 2
+    xs = xs[xs < width]
+    ys = ys[ys < height]
+    
+    cy, cx = np.meshgrid(ys, xs, indexing='ij')
+    return cx.ravel(), cy.ravel()
+
+
 def create_grid_visualization(
     image: Image.Image, 
     cell_size: int,
@@ -429,48 +799,23 @@ def create_grid_visualization(
     Returns:
         New RGBA image with grid overlay.
     """
-    # Convert to RGBA
-    if image.mode != 'RGBA':
-        viz_image = image.convert('RGBA')
-    else:
-        viz_image = image.copy()
-    
-    # Create overlay
-    overlay = Image.new('RGBA', viz_image.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    # Convert to RGBA (alpha_composite returns a new image, so no copy needed)
+    viz_image = image if image.mode == 'RGBA' else image.convert('RGBA')
     
     width, height = image.size
     
-    # Draw vertical lines
-    for x in range(offset_x, width + 1, cell_size):
-        if x >= 0:
-            draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-    
-    # Draw horizontal lines
-    for y in range(offset_y, height + 1, cell_size):
-        if y >= 0:
-            draw.line([(0, y), (width, y)], fill=grid_color, width=1)
+    # Create overlay
+    overlay = np.zeros((height, width, 4), dtype=np.uint8)
+    _draw_lines(overlay, cell_size, offset_x, offset_y, grid_color)
     
     # Draw center markers
     if center_marker:
         center_color: ColorRGBA = (0, 255, 0, 200)
         marker_size = max(1, cell_size // 8)
-        
-        start_x = offset_x if offset_x >= 0 else offset_x % cell_size
-        start_y = offset_y if offset_y >= 0 else offset_y % cell_size
-        
-        for y in range(start_y, height, cell_size):
-            for x in range(start_x, width, cell_size):
-                cx = x + cell_size // 2
-                cy = y + cell_size // 2
-                if cx < width and cy < height:
-                    draw.ellipse(
-                        [(cx - marker_size, cy - marker_size), 
-                         (cx + marker_size, cy + marker_size)],
-                        fill=center_color
-                    )
+        cx, cy = _cell_centers(width, height, cell_size, offset_x, offset_y)
+        _draw_markers(overlay, cx, cy, 'dot', marker_size, center_color)
     
-    return Image.alpha_composite(viz_image, overlay)
+    return Image.alpha_composite(viz_image, Image.fromarray(overlay))
 
 
 def draw_grid_overlay(
@@ -510,66 +855,32 @@ def draw_grid_overlay(
     Returns:
         New RGBA image with overlay.
     """
-    # Convert to RGBA
-    if image.mode != 'RGBA':
-        viz = image.convert('RGBA')
-    else:
-        viz = image.copy()
-    
-    overlay = Image.new('RGBA', viz.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    # Convert to RGBA (alpha_composite returns a new image, so no copy needed)
+    viz = image if image.mode == 'RGBA' else image.convert('RGBA')
     
     width, height = image.size
+    overlay = np.zeros((height, width, 4), dtype=np.uint8)
     
     # Draw grid lines
     if show_grid:
-        for x in range(offset_x, width + 1, cell_size):
-            if x >= 0:
-                draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-        for y in range(offset_y, height + 1, cell_size):
-            if y >= 0:
-                draw.line([(0, y), (width, y)], fill=grid_color, width=1)
+        _draw_lines(overlay, cell_size, offset_x, offset_y, grid_color)
     
     # Draw center markers
     if show_centers:
         marker_size = max(1, cell_size // 8)
-        start_x = offset_x if offset_x >= 0 else offset_x % cell_size
-        start_y = offset_y if offset_y >= 0 else offset_y % cell_size
+        cx, cy = _cell_centers(width, height, cell_size, offset_x, offset_y)
         
-        excluded: list[Color] = [c for c in (excluded_colors or []) if c is not None]
+        # Look up centers in the cached exclusion mask
+        is_excluded = _excluded_mask(image, bit_depth, excluded_colors, tolerance)[cy, cx]
         
-        for y in range(start_y, height, cell_size):
-            for x in range(start_x, width, cell_size):
-                cx = x + cell_size // 2
-                cy = y + cell_size // 2
-                
-                if 0 <= cx < width and 0 <= cy < height:
-                    pixel = image.getpixel((cx, cy))[:3]
-                    reduced = reduce_color(pixel, bit_depth)
-                    
-                    is_excluded = any(
-                        colors_similar(reduced, exc, tolerance)
-                        for exc in excluded
-                    )
-                    
-                    if is_excluded:
-                        # Draw X for excluded
-                        draw.line(
-                            [(cx - marker_size, cy - marker_size), 
-                             (cx + marker_size, cy + marker_size)],
-                            fill=excluded_color, width=2
-                        )
-                        draw.line(
-                            [(cx + marker_size, cy - marker_size), 
-                             (cx - marker_size, cy + marker_size)],
-                            fill=excluded_color, width=2
-                        )
-                    else:
-                        # Draw circle for included
-                        draw.ellipse(
-                            [(cx - marker_size, cy - marker_size), 
-                             (cx + marker_size, cy + marker_size)],
-                            fill=center_color
-                        )
-    
-    return Image.alpha_composite(viz, overlay)
+        # Circle for included, X for excluded
+        _draw_markers(
+            overlay, cx[~is_excluded], cy[~is_excluded],
+            'dot', marker_size, center_color
+        )
+        _draw_markers(
+            overlay, cx[is_excluded], cy[is_excluded],
+            'cross', marker_size, excluded_color
+        )
+    
+    return Image.alpha_composite(viz, Image.fromarray(overlay))
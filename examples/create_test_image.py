@@ -3,6 +3,7 @@ Script de prueba para generar una imagen pixel art de ejemplo
 y demostrar el funcionamiento del transformador.
 """
 
+import numpy as np
 from PIL import Image
 import os
 
@@ -34,19 +35,13 @@ art_height = len(pixel_art)
 scaled_width = art_width * PIXEL_SIZE
 scaled_height = art_height * PIXEL_SIZE
 
-# Crear imagen escalada (simulando pixel art redimensionado)
-scaled_image = Image.new('RGB', (scaled_width, scaled_height))
-
-for y, row in enumerate(pixel_art):
-    for x, color_idx in enumerate(row):
-        color = palette[color_idx]
-        # Rellenar el bloque de PIXEL_SIZE x PIXEL_SIZE
-        for py in range(PIXEL_SIZE):
-            for px in range(PIXEL_SIZE):
-                scaled_image.putpixel(
-                    (x * PIXEL_SIZE + px, y * PIXEL_SIZE + py),
-                    color
-                )
+# Crear imagen escalada (simulando pixel art redimensionado):
+# cada índice se traduce a su color y cada pixel se repite en un bloque
+# de PIXEL_SIZE x PIXEL_SIZE
+palette_arr = np.array([palette[i] for i in range(len(palette))], dtype=np.uint8)
+small = palette_arr[np.array(pixel_art, dtype=np.uint8)]
+scaled = small.repeat(PIXEL_SIZE, axis=0).repeat(PIXEL_SIZE, axis=1)
+scaled_image = Image.fromarray(scaled)
 
 # Guardar imagen de prueba
 output_path = os.path.join(os.path.dirname(__file__), 'test_heart.png')
@@ -4,6 +4,14 @@ Pixel Art Transformer - GUI Package
 Tkinter GUI components for the pixel art transformer.
 """
 
+import os
+import sys
+
+# Make the top-level config/core modules importable from any working directory
+_PARENT = os.path.dirname(os.path.dirname(__file__))
+if _PARENT not in sys.path:
+    sys.path.insert(0, _PARENT)
+
 from .canvases import RegionSelectCanvas, RegionEditorCanvas
 from .steps import Step1Frame, Step2Frame, Step3Frame, Step4Frame
 from .grid_editor import AdvancedGridEditorCanvas, GridConfig, EditorMode
@@ -6,18 +6,17 @@ Zoomable canvas widgets for image display and region selection.
 
 from __future__ import annotations
 
+import sys
 import tkinter as tk
 from typing import Callable, TYPE_CHECKING
 
-from PIL import Image, ImageTk
+import numpy as np
+from PIL import Image
 
 if TYPE_CHECKING:
+    from PIL import ImageTk
     from PIL.Image import Image as PILImage
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from config import ZOOM, UI_COLORS, WINDOW
 
 
@@ -64,6 +63,16 @@ class BaseZoomableCanvas(tk.Canvas):
         
         self.image: PILImage | None = None
         self.photo: ImageTk.PhotoImage | None = None
+        self._image_array: np.ndarray | None = None
+        self._pyramid: list[PILImage] = []
+        self._rgb_cache: np.ndarray | None = None
+        
+        # Largest valid image coordinates, for clamping
+        self._max_ix: int = sys.maxsize
+        self._max_iy: int = sys.maxsize
+        self._photo_key: tuple | None = None  # Inputs of the current photo; subclasses may extend it
+        self._image_item: int | None = None
+        self._info_items: list[int] = []  # Info text items, reused across redraws
         
         self.zoom_level: float = ZOOM.default
         self.max_zoom: float = max_zoom
@@ -77,13 +86,21 @@ class BaseZoomableCanvas(tk.Canvas):
         # Pan state
         self._pan_start: tuple[int, int] | None = None
         
+        # Canvas size, tracked from <Configure> events
+        self._canvas_w: int = 0
+        self._canvas_h: int = 0
+        self._reset_pending = False
+        
+        # Set while an idle-time redraw is scheduled
+        self._redraw_pending = False
+        
         # Bind events
         self.bind('<MouseWheel>', self._on_mousewheel)
         self.bind('<Button-4>', self._on_mousewheel)  # Linux scroll up
         self.bind('<Button-5>', self._on_mousewheel)  # Linux scroll down
         self.bind('<ButtonPress-3>', self._on_pan_start)
         self.bind('<B3-Motion>', self._on_pan)
-        self.bind('<Configure>', lambda e: self.redraw())
+        self.bind('<Configure>', self._on_configure)
     
     def set_image(self, image: PILImage) -> None:
         """
@@ -93,6 +110,12 @@ class BaseZoomableCanvas(tk.Canvas):
             image: PIL Image to display.
         """
         self.image = image
+        self._max_ix = image.size[0] - 1
+        self._max_iy = image.size[1] - 1
+        self._image_array = None
+        self._rgb_cache = None
+        self._pyramid = [image]
+        self._photo_key = None
         self.reset_view()
         self.redraw()
     
@@ -101,9 +124,8 @@ class BaseZoomableCanvas(tk.Canvas):
         if self.image is None:
             return
         
-        self.update_idletasks()
-        canvas_w = self.winfo_width()
-        canvas_h = self.winfo_height()
+        canvas_w = self._canvas_w
+        canvas_h = self._canvas_h
         
         if canvas_w > WINDOW.min_canvas_size and canvas_h > WINDOW.min_canvas_size:
             img_w, img_h = self.image.size
@@ -112,6 +134,10 @@ class BaseZoomableCanvas(tk.Canvas):
                 canvas_h / img_h, 
                 self.initial_max_zoom
             )
+            self._reset_pending = False
+        else:
+            # Not laid out yet: fit once <Configure> reports the real size
+            self._reset_pending = True
         
         self.offset_x = 0
         self.offset_y = 0
@@ -121,36 +147,226 @@ class BaseZoomableCanvas(tk.Canvas):
         if self.image is None:
             return
         
-        self.delete("all")
-        
         img_w, img_h = self.image.size
         new_w = max(1, int(img_w * self.zoom_level))
         new_h = max(1, int(img_h * self.zoom_level))
         
-        resized = self.image.resize((new_w, new_h), Image.Resampling.NEAREST)
-        self.photo = ImageTk.PhotoImage(resized)
-        
-        canvas_w = self.winfo_width()
-        canvas_h = self.winfo_height()
-        self.img_x = (canvas_w - new_w) // 2 + self.offset_x
-        self.img_y = (canvas_h - new_h) // 2 + self.offset_y
+        self.img_x = (self._canvas_w - new_w) // 2 + self.offset_x
+        self.img_y = (self._canvas_h - new_h) // 2 + self.offset_y
         
-        self.create_image(self.img_x, self.img_y, anchor=tk.NW, image=self.photo)
+        self._draw_image(new_w, new_h)
         
         # Draw zoom info
         zoom_pct = int(self.zoom_level * 100)
         self._draw_info(zoom_pct)
     
-    def _draw_info(self, zoom_pct: int) -> None:
-        """Draw info text. Override in subclasses."""
-        self.create_text(
-            10, 10, 
-            text=f"Zoom: {zoom_pct}%", 
-            fill=UI_COLORS.accent_green, 
-            anchor=tk.NW, 
-            font=('Segoe UI', 9)
+    def _draw_image(self, new_w: int, new_h: int) -> None:
+        """
+        Show the visible part of the zoomed image at img_x, img_y.
+        
+        The existing image item is moved instead of recreated; subclasses
+        that clear the canvas must reset _image_item first.
+        
+        Args:
+            new_w: Zoomed image width in pixels.
+            new_h: Zoomed image height in pixels.
+        """
+        box = self._visible_box(new_w, new_h)
+        self._update_photo(new_w, new_h, box)
+        
+        x = self.img_x + box[0]
+        y = self.img_y + box[1]
+        if self._image_item is None:
+            self._image_item = self.create_image(x, y, anchor=tk.NW, image=self.photo)
+        else:
+            self.coords(self._image_item, x, y)
+            self.itemconfigure(self._image_item, image=self.photo)
+    
+    def _visible_box(self, new_w: int, new_h: int) -> tuple[int, int, int, int]:
+        """
+        Get the part of the zoomed image that lies inside the canvas.
+        
+        Returns:
+            (x1, y1, x2, y2) in zoomed image pixels, at least 1×1.
+        """
+        x1 = min(max(0, -self.img_x), new_w - 1)
+        y1 = min(max(0, -self.img_y), new_h - 1)
+        x2 = max(min(new_w, self._canvas_w - self.img_x), x1 + 1)
+        y2 = max(min(new_h, self._canvas_h - self.img_y), y1 + 1)
+        return x1, y1, x2, y2
+    
+    def _update_photo(
+        self, 
+        new_w: int, 
+        new_h: int, 
+        box: tuple[int, int, int, int]
+    ) -> None:
+        """
+        Rebuild the display PhotoImage only if its content changed.
+        
+        While the whole image fits in the canvas, panning keeps the same
+        box, so the previous PhotoImage is reused instead of resizing and
+        uploading it again.
+        
+        Args:
+            new_w: Zoomed image width in pixels.
+            new_h: Zoomed image height in pixels.
+            box: Visible part of the zoomed image.
+        """
+        key = (id(self.image), new_w, new_h, box)
+        if self.photo is None or key != self._photo_key:
+            self._set_photo(self._zoomed_image(new_w, new_h, box))
+            self._photo_key = key
+    
+    def _set_photo(self, image: PILImage) -> None:
+        """
+        Show an image through self.photo.
+        
+        When the size is unchanged (e.g. panning a clipped view), the
+        pixels are pasted into the existing PhotoImage instead of
+        allocating a new Tk image.
+        
+        Args:
+            image: Image to display.
+        """
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(image)
+        else:
+            from PIL import ImageTk
+            self.photo = ImageTk.PhotoImage(image)
+    
+    def _zoomed_image(
+        self, 
+        new_w: int, 
+        new_h: int, 
+        box: tuple[int, int, int, int]
+    ) -> PILImage:
+        """
+        Scale the image with nearest-neighbor and cut out the visible box.
+        
+        Only the visible pixels are produced, so high zoom levels never
+        materialize the full zoomed bitmap. Native size skips the resize,
+        integer zoom factors repeat rows and columns of the image array,
+        and zooming out resamples the closest preview pyramid level.
+        
+        Args:
+            new_w: Zoomed image width in pixels.
+            new_h: Zoomed image height in pixels.
+            box: (x1, y1, x2, y2) to produce, in zoomed image pixels.
+        
+        Returns:
+            Image of the box's size.
+        """
+        img_w, img_h = self.image.size
+        x1, y1, x2, y2 = box
+        
+        if (new_w, new_h) == (img_w, img_h):
+            return self.image if box == (0, 0, img_w, img_h) else self.image.crop(box)
+        
+        factor = new_w // img_w
+        if (
+            factor >= 2
+            and new_w == img_w * factor and new_h == img_h * factor
+            and self.image.mode in ('RGB', 'RGBA', 'L')
+        ):
+            if self._image_array is None:
+                self._image_array = np.asarray(self.image)
+            
+            # Repeat only the source pixels under the box, then trim
+            src = self._image_array[
+                y1 // factor:-(-y2 // factor), 
+                x1 // factor:-(-x2 // factor)
+            ]
+            up = src.repeat(factor, 0).repeat(factor, 1)
+            ox, oy = x1 % factor, y1 % factor
+            return Image.fromarray(up[oy:oy + y2 - y1, ox:ox + x2 - x1])
+        
+        source = self._pyramid_level(new_w, new_h)
+        scale_x = source.size[0] / new_w
+        scale_y = source.size[1] / new_h
+        return source.resize(
+            (x2 - x1, y2 - y1), 
+            Image.Resampling.NEAREST,
+            box=(x1 * scale_x, y1 * scale_y, x2 * scale_x, y2 * scale_y)
         )
     
+    def _pyramid_level(self, new_w: int, new_h: int) -> PILImage:
+        """
+        Get the smallest preview level that is still at least new_w × new_h.
+        
+        Each level halves the previous one with nearest-neighbor, so it
+        holds exact source pixels. Levels are built on first use.
+        
+        Args:
+            new_w: Target width in pixels.
+            new_h: Target height in pixels.
+        
+        Returns:
+            Image to resample for the target size.
+        """
+        if not self._pyramid or self._pyramid[0] is not self.image:
+            self._pyramid = [self.image]
+        
+        level = 0
+        while True:
+            w, h = self._pyramid[level].size
+            if w // 2 < new_w or h // 2 < new_h:
+                return self._pyramid[level]
+            
+            level += 1
+            if level == len(self._pyramid):
+                self._pyramid.append(
+                    self._pyramid[-1].resize((w // 2, h // 2), Image.Resampling.NEAREST)
+                )
+    
+    def rgb_array(self) -> np.ndarray:
+        """Get the image as an (H, W, 3) RGB array, converted once per image."""
+        if self._rgb_cache is None:
+            self._rgb_cache = np.asarray(self.image.convert('RGB'))
+        return self._rgb_cache
+    
+    def pick_color(self, ix: int, iy: int) -> tuple[int, int, int]:
+        """Get the RGB color of an image pixel."""
+        r, g, b = self.rgb_array()[iy, ix].tolist()
+        return (r, g, b)
+    
+    def _draw_info(self, zoom_pct: int) -> None:
+        """Draw info text tagged 'info'. Override in subclasses."""
+        self._show_info_lines([f"Zoom: {zoom_pct}%"])
+    
+    def _show_info_lines(
+        self,
+        lines: list[str],
+        styles: list[tuple[str, tuple]] | None = None
+    ) -> None:
+        """
+        Show lines of info text at the top left, one 18px row each.
+        
+        The text items are reused across redraws; usually only their
+        text changes.
+        
+        Args:
+            lines: Text of each row.
+            styles: Optional (fill, font) per row; defaults to green 9pt.
+        """
+        for i, line in enumerate(lines):
+            fill, font = styles[i] if styles else (UI_COLORS.accent_green, ('Segoe UI', 9))
+            if i < len(self._info_items):
+                self.itemconfigure(self._info_items[i], text=line, fill=fill, font=font)
+            else:
+                self._info_items.append(self.create_text(
+                    10, 10 + i * 18,
+                    text=line,
+                    fill=fill,
+                    anchor=tk.NW,
+                    font=font,
+                    tags='info'
+                ))
+        for item in self._info_items[len(lines):]:
+            self.delete(item)
+        del self._info_items[len(lines):]
+        self.tag_raise('info')  # Stay above items created after the first redraw
+    
     def screen_to_image(self, sx: int, sy: int) -> tuple[int, int]:
         """
         Convert screen coordinates to image coordinates.
@@ -162,13 +378,8 @@ class BaseZoomableCanvas(tk.Canvas):
         Returns:
             Tuple of (image_x, image_y), clamped to image bounds.
         """
-        ix = int((sx - self.img_x) / self.zoom_level)
-        iy = int((sy - self.img_y) / self.zoom_level)
-        
-        if self.image:
-            ix = max(0, min(ix, self.image.size[0] - 1))
-            iy = max(0, min(iy, self.image.size[1] - 1))
-        
+        ix = min(max(int((sx - self.img_x) / self.zoom_level), 0), self._max_ix)
+        iy = min(max(int((sy - self.img_y) / self.zoom_level), 0), self._max_iy)
         return ix, iy
     
     def image_to_screen(self, ix: int, iy: int) -> tuple[int, int]:
@@ -186,6 +397,22 @@ class BaseZoomableCanvas(tk.Canvas):
         sy = self.img_y + int(iy * self.zoom_level)
         return sx, sy
     
+    def image_to_screen_array(self, coords: np.ndarray) -> np.ndarray:
+        """
+        Convert many image coordinates to screen coordinates at once.
+        
+        Args:
+            coords: Array whose last axis holds alternating x, y values,
+                    e.g. (N, 2) points or (N, 4) boxes.
+        
+        Returns:
+            Integer array of the same shape in screen coordinates.
+        """
+        screen = (np.asarray(coords) * self.zoom_level).astype(np.int64)
+        screen[..., 0::2] += self.img_x
+        screen[..., 1::2] += self.img_y
+        return screen
+    
     def _on_mousewheel(self, event: tk.Event) -> None:
         """Handle mouse wheel zoom."""
         if self.image is None:
@@ -207,17 +434,42 @@ class BaseZoomableCanvas(tk.Canvas):
         
         if new_zoom != self.zoom_level:
             # Zoom centered on mouse position
-            canvas_w = self.winfo_width()
-            canvas_h = self.winfo_height()
-            mouse_x = event.x - canvas_w // 2
-            mouse_y = event.y - canvas_h // 2
+            mouse_x = event.x - self._canvas_w // 2
+            mouse_y = event.y - self._canvas_h // 2
             
+            # offset' = mouse - (mouse - offset) * ratio, with ratio - 1 shared
             ratio = new_zoom / self.zoom_level
-            self.offset_x = int(mouse_x - (mouse_x - self.offset_x) * ratio)
-            self.offset_y = int(mouse_y - (mouse_y - self.offset_y) * ratio)
+            ratio_m1 = ratio - 1.0
+            self.offset_x = int(self.offset_x * ratio - mouse_x * ratio_m1)
+            self.offset_y = int(self.offset_y * ratio - mouse_y * ratio_m1)
             self.zoom_level = new_zoom
             
-            self.redraw()
+            self._request_redraw()
+    
+    def _request_redraw(self) -> None:
+        """
+        Schedule a redraw for when Tk is idle.
+        
+        Bursts of wheel, drag or resize events only update state; the
+        pending redraw then runs once with the latest values.
+        """
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._do_pending_redraw)
+    
+    def _do_pending_redraw(self) -> None:
+        """Run the redraw scheduled by _request_redraw."""
+        self._redraw_pending = False
+        self.redraw()
+    
+    def _on_configure(self, event: tk.Event) -> None:
+        """Track the canvas size and redraw."""
+        self._canvas_w = event.width
+        self._canvas_h = event.height
+        
+        if self._reset_pending:
+            self.reset_view()
+        self._request_redraw()
     
     def _on_pan_start(self, event: tk.Event) -> None:
         """Start panning."""
@@ -234,7 +486,7 @@ class BaseZoomableCanvas(tk.Canvas):
         self.offset_y += dy
         self._pan_start = (event.x, event.y)
         
-        self.redraw()
+        self._request_redraw()
 
 
 # =============================================================================
@@ -269,6 +521,9 @@ class RegionSelectCanvas(BaseZoomableCanvas):
         self.on_region_added = on_region_added
         self.regions: list[tuple[int, int, int, int]] = []
         
+        # (rectangle, label) canvas items, one pair per region
+        self._region_items: list[tuple[int, int]] = []
+        
         # Selection state
         self._selecting = False
         self._select_start: tuple[int, int] | None = None
@@ -291,40 +546,47 @@ class RegionSelectCanvas(BaseZoomableCanvas):
         if self.image is None:
             return
         
-        # Draw existing regions
-        for i, (x1, y1, x2, y2) in enumerate(self.regions):
-            sx1, sy1 = self.image_to_screen(x1, y1)
-            sx2, sy2 = self.image_to_screen(x2, y2)
+        # Drop items left over from removed regions
+        for rect_id, text_id in self._region_items[len(self.regions):]:
+            self.delete(rect_id, text_id)
+        del self._region_items[len(self.regions):]
+        
+        # Move existing region items, create items only for new regions.
+        # Labels are by index, so they stay valid after a removal.
+        boxes = self.image_to_screen_array(np.reshape(self.regions, (-1, 4)))
+        for i, (sx1, sy1, sx2, sy2) in enumerate(boxes.tolist()):
+            if i < len(self._region_items):
+                rect_id, text_id = self._region_items[i]
+                self.coords(rect_id, sx1, sy1, sx2, sy2)
+                self.coords(text_id, sx1 + 5, sy1 + 5)
+                continue
             
-            self.create_rectangle(
+            rect_id = self.create_rectangle(
                 sx1, sy1, sx2, sy2, 
                 outline=UI_COLORS.region_outline, 
                 width=2, 
                 tags=f'region_{i}'
             )
-            self.create_text(
+            text_id = self.create_text(
                 sx1 + 5, sy1 + 5, 
                 text=str(i + 1), 
                 fill=UI_COLORS.region_outline,
                 anchor=tk.NW, 
                 font=('Segoe UI', 10, 'bold')
             )
+            self._region_items.append((rect_id, text_id))
     
     def _draw_info(self, zoom_pct: int) -> None:
         """Draw info with region count."""
-        self.create_text(
-            10, 10, 
-            text=f"Zoom: {zoom_pct}% | Regiones: {len(self.regions)}", 
-            fill=UI_COLORS.accent_green, 
-            anchor=tk.NW, 
-            font=('Segoe UI', 9)
-        )
-        self.create_text(
-            10, 28, 
-            text="Click+arrastrar: seleccionar | Click derecho: mover", 
-            fill=UI_COLORS.muted, 
-            anchor=tk.NW, 
-            font=('Segoe UI', 8)
+        self._show_info_lines(
+            [
+                f"Zoom: {zoom_pct}% | Regiones: {len(self.regions)}",
+                "Click+arrastrar: seleccionar | Click derecho: mover",
+            ],
+            styles=[
+                (UI_COLORS.accent_green, ('Segoe UI', 9)),
+                (UI_COLORS.muted, ('Segoe UI', 8)),
+            ]
         )
     
     def _on_press(self, event: tk.Event) -> None:
@@ -456,20 +718,14 @@ class RegionEditorCanvas(BaseZoomableCanvas):
     def _draw_info(self, zoom_pct: int) -> None:
         """Draw info with eyedropper status."""
         mode_text = " [🎯 EYEDROPPER]" if self._eyedropper_mode else ""
-        self.create_text(
-            10, 10, 
-            text=f"Zoom: {zoom_pct}%{mode_text}", 
-            fill=UI_COLORS.accent_green, 
-            anchor=tk.NW, 
-            font=('Segoe UI', 9)
-        )
+        self._show_info_lines([f"Zoom: {zoom_pct}%{mode_text}"])
     
     def _on_click(self, event: tk.Event) -> None:
         """Handle left click - eyedropper or start pan."""
         if self._eyedropper_mode and self.image:
             ix, iy = self.screen_to_image(event.x, event.y)
             if 0 <= ix < self.image.size[0] and 0 <= iy < self.image.size[1]:
-                color = self.image.getpixel((ix, iy))[:3]
+                color = self.pick_color(ix, iy)
                 if self._eyedropper_callback:
                     self._eyedropper_callback(color)
             self.disable_eyedropper()
@@ -490,7 +746,7 @@ class RegionEditorCanvas(BaseZoomableCanvas):
         self.offset_y += dy
         self._drag_start = (event.x, event.y)
         
-        self.redraw()
+        self._request_redraw()
     
     def _on_drag_end(self, event: tk.Event) -> None:
         """End drag."""
@@ -11,15 +11,12 @@ from typing import Callable, Literal, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
 
-from PIL import Image, ImageTk, ImageDraw
+import numpy as np
+from PIL import Image, ImageColor
 
 if TYPE_CHECKING:
     from PIL.Image import Image as PILImage
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from config import ZOOM, UI_COLORS, WINDOW, GRID_EDITOR
 from gui.canvases import BaseZoomableCanvas
 
@@ -28,6 +25,11 @@ from gui.canvases import BaseZoomableCanvas
 # ENUMS AND DATA CLASSES
 # =============================================================================
 
+# Cell selection states stored in GridConfig.cell_state
+CELL_NEUTRAL = 0
+CELL_EXCLUDED = 1   # Manually excluded
+CELL_INCLUDED = 2   # Manually included (overrides color exclusion)
+
 class EditorMode(Enum):
     """Editor interaction modes."""
     PAN_ZOOM = "pan_zoom"
@@ -51,20 +53,23 @@ class GridConfig:
     """
     Configuration for a non-uniform grid.
     
-    The grid is defined by lists of line positions, allowing
-    each cell to have a different size.
+    The grid is defined by sorted int32 arrays of line positions,
+    allowing each cell to have a different size.
     """
     # X positions of vertical lines (including left and right edges)
-    x_lines: list[int] = field(default_factory=list)
+    x_lines: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
     
     # Y positions of horizontal lines (including top and bottom edges)
-    y_lines: list[int] = field(default_factory=list)
+    y_lines: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
     
-    # Cells manually excluded (col, row)
-    excluded_cells: set[tuple[int, int]] = field(default_factory=set)
+    # Selection state of each cell (CELL_* values), indexed [row, col]
+    cell_state: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.uint8))
     
-    # Cells manually included (overrides color exclusion)
-    included_cells: set[tuple[int, int]] = field(default_factory=set)
+    def __post_init__(self) -> None:
+        """Accept any sequence of line positions."""
+        self.x_lines = np.asarray(self.x_lines, dtype=np.int32)
+        self.y_lines = np.asarray(self.y_lines, dtype=np.int32)
+        self.cell_state = np.asarray(self.cell_state, dtype=np.uint8)
     
     @property
     def num_cols(self) -> int:
@@ -76,48 +81,100 @@ class GridConfig:
         """Number of rows."""
         return max(0, len(self.y_lines) - 1)
     
+    @property
+    def state(self) -> np.ndarray:
+        """Cell state array matching the current grid size, indexed [row, col]."""
+        shape = (self.num_rows, self.num_cols)
+        if self.cell_state.shape != shape:
+            # Grid size changed: keep the state of overlapping cells
+            resized = np.zeros(shape, dtype=np.uint8)
+            rows = min(shape[0], self.cell_state.shape[0])
+            cols = min(shape[1], self.cell_state.shape[1])
+            resized[:rows, :cols] = self.cell_state[:rows, :cols]
+            self.cell_state = resized
+        return self.cell_state
+    
+    @property
+    def excluded_cells(self) -> frozenset[tuple[int, int]]:
+        """Cells manually excluded, as (col, row) pairs. Read-only; edit `state`."""
+        rows, cols = np.nonzero(self.state == CELL_EXCLUDED)
+        return frozenset(zip(cols.tolist(), rows.tolist()))
+    
+    @property
+    def included_cells(self) -> frozenset[tuple[int, int]]:
+        """Cells manually included, as (col, row) pairs. Read-only; edit `state`."""
+        rows, cols = np.nonzero(self.state == CELL_INCLUDED)
+        return frozenset(zip(cols.tolist(), rows.tolist()))
+    
+    def excluded_mask(self) -> np.ndarray:
+        """Boolean (num_rows, num_cols) mask of manually excluded cells."""
+        return self.state == CELL_EXCLUDED
+    
+    def included_mask(self) -> np.ndarray:
+        """Boolean (num_rows, num_cols) mask of manually included cells."""
+        return self.state == CELL_INCLUDED
+    
+    def in_grid(self, col: int, row: int) -> bool:
+        """Check if (col, row) is a valid cell."""
+        return 0 <= col < self.num_cols and 0 <= row < self.num_rows
+    
     def get_cell_bounds(self, col: int, row: int) -> tuple[int, int, int, int]:
         """Get (x1, y1, x2, y2) for a cell."""
         if col < 0 or col >= self.num_cols or row < 0 or row >= self.num_rows:
             return (0, 0, 0, 0)
         return (
-            self.x_lines[col],
-            self.y_lines[row],
-            self.x_lines[col + 1],
-            self.y_lines[row + 1]
+            int(self.x_lines[col]),
+            int(self.y_lines[row]),
+            int(self.x_lines[col + 1]),
+            int(self.y_lines[row + 1])
         )
     
+    def hit_cell(self, x: int, y: int) -> tuple[int, int] | None:
+        """Get the (col, row) of the cell containing image point (x, y), or None."""
+        col = int(np.searchsorted(self.x_lines, x, side='right')) - 1
+        row = int(np.searchsorted(self.y_lines, y, side='right')) - 1
+        if 0 <= col < self.num_cols and 0 <= row < self.num_rows:
+            return (col, row)
+        return None
+    
+    def hit_cells(self, xs: np.ndarray, ys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized hit_cell: get (cols, rows, valid) for arrays of image points."""
+        cols = np.searchsorted(self.x_lines, xs, side='right') - 1
+        rows = np.searchsorted(self.y_lines, ys, side='right') - 1
+        valid = (cols >= 0) & (cols < self.num_cols) & (rows >= 0) & (rows < self.num_rows)
+        return cols, rows, valid
+    
     def get_cell_center(self, col: int, row: int) -> tuple[int, int]:
         """Get the center point of a cell."""
         x1, y1, x2, y2 = self.get_cell_bounds(col, row)
         return ((x1 + x2) // 2, (y1 + y2) // 2)
     
+    def cell_centers(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the center x of every column and center y of every row."""
+        cx = (self.x_lines[:-1] + self.x_lines[1:]) // 2
+        cy = (self.y_lines[:-1] + self.y_lines[1:]) // 2
+        return cx, cy
+    
     def is_cell_excluded(self, col: int, row: int) -> bool:
         """Check if a cell is excluded."""
-        return (col, row) in self.excluded_cells
+        return self.in_grid(col, row) and self.state[row, col] == CELL_EXCLUDED
     
     def is_cell_included(self, col: int, row: int) -> bool:
         """Check if a cell is manually included."""
-        return (col, row) in self.included_cells
+        return self.in_grid(col, row) and self.state[row, col] == CELL_INCLUDED
     
     def toggle_cell(self, col: int, row: int) -> None:
-        """Toggle a cell's exclusion state."""
-        cell = (col, row)
-        if cell in self.excluded_cells:
-            self.excluded_cells.remove(cell)
-            self.included_cells.add(cell)
-        elif cell in self.included_cells:
-            self.included_cells.remove(cell)
-        else:
-            self.excluded_cells.add(cell)
+        """Toggle a cell's exclusion state (neutral → excluded → included → neutral)."""
+        if self.in_grid(col, row):
+            state = self.state
+            state[row, col] = (state[row, col] + 1) % 3
     
     def copy(self) -> 'GridConfig':
         """Create a copy of this config."""
         return GridConfig(
             x_lines=self.x_lines.copy(),
             y_lines=self.y_lines.copy(),
-            excluded_cells=self.excluded_cells.copy(),
-            included_cells=self.included_cells.copy()
+            cell_state=self.state.copy()
         )
     
     @staticmethod
@@ -132,25 +189,48 @@ class GridConfig:
         start_x = offset_x if offset_x >= 0 else offset_x % cell_size
         start_y = offset_y if offset_y >= 0 else offset_y % cell_size
         
-        x_lines = list(range(start_x, width + 1, cell_size))
-        if x_lines and x_lines[-1] < width:
-            x_lines.append(width)
-        if not x_lines or x_lines[0] > 0:
-            x_lines.insert(0, 0)
-            
-        y_lines = list(range(start_y, height + 1, cell_size))
-        if y_lines and y_lines[-1] < height:
-            y_lines.append(height)
-        if not y_lines or y_lines[0] > 0:
-            y_lines.insert(0, 0)
-        
-        return GridConfig(x_lines=x_lines, y_lines=y_lines)
+        return GridConfig(
+            x_lines=GridConfig._uniform_lines(start_x, width, cell_size),
+            y_lines=GridConfig._uniform_lines(start_y, height, cell_size)
+        )
+    
+    @staticmethod
+    def _uniform_lines(start: int, size: int, cell_size: int) -> np.ndarray:
+        """Get evenly spaced line positions from start, closed with 0 and size."""
+        lines = np.arange(start, size + 1, cell_size, dtype=np.int32)
+        if lines.size and lines[-1] < size:
+            lines = np.append(lines, np.int32(size))
+        if not lines.size or lines[0] > 0:
+            lines = np.insert(lines, 0, 0)
+        return lines
 
 
 # =============================================================================
 # ADVANCED GRID EDITOR CANVAS
 # =============================================================================
 
+# Tags of the canvas items drawn above the image, recreated on every refresh
+_OVERLAY_TAGS = (
+    'grid_line', 'cell_hover', 'area_selection', 'contour_line',
+    'contour_vertex', 'pixel_definition', 'pixel_size',
+)
+
+# Canvas cursor per mode; ADJUST_GRID depends on the hovered line instead
+_MODE_CURSORS = {
+    EditorMode.PAN_ZOOM: '',
+    EditorMode.SELECT_CELLS: 'hand2',
+    EditorMode.AREA_SELECT: 'cross',
+    EditorMode.CONTOUR_SELECT: 'pencil',
+    EditorMode.DEFINE_PIXEL: 'tcross',
+}
+
+_GRID_CURSORS = {
+    DragTarget.V_LINE: 'sb_h_double_arrow',
+    DragTarget.H_LINE: 'sb_v_double_arrow',
+    DragTarget.CORNER: 'fleur',
+}
+
+
 class AdvancedGridEditorCanvas(BaseZoomableCanvas):
     """
     Canvas for advanced grid editing with:
@@ -193,19 +273,28 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         
         # Grid configuration
         self.grid_config: GridConfig = GridConfig()
+        self._centers: tuple[np.ndarray, np.ndarray] | None = None  # Cached cell centers
+        self._color_mask_cache: tuple[Image.Image | None, tuple, np.ndarray] | None = None
+        self._contour_cache: tuple[tuple, np.ndarray] | None = None
+        self._screen_lines: tuple[tuple, np.ndarray, np.ndarray] | None = None
         
         # Editor mode
         self.mode: EditorMode = EditorMode.PAN_ZOOM
         
         # Drag state
         self._drag_target: DragTarget = DragTarget.NONE
-        self._drag_line_index: int = -1
+        self._drag_line_index: int | tuple[int, int] = -1  # (v_idx, h_idx) for corners
         self._drag_start_pos: tuple[int, int] = (0, 0)
-        self._drag_original_value: int = 0
+        self._drag_original_value: int | tuple[int, int] = 0
+        self._current_cursor = ''  # Last cursor passed to Tk
+        self._drag_bounds: tuple = ()  # Clamp range(s) of the dragged line(s), set on press
         
         # Hover state
-        self._hover_line: tuple[DragTarget, int] | None = None
+        self._hover_line: tuple[DragTarget, int | tuple[int, int]] | None = None
         self._hover_cell: tuple[int, int] | None = None
+        self._pending_motion: tk.Event | None = None  # Latest unprocessed <Motion>
+        self._last_drag_xy: tuple[int, int] = (0, 0)  # Previous SELECT_CELLS drag position
+        self._overlay_pending = False  # Overlay-only refresh scheduled
         
         # Pan state for pan_zoom mode
         self._panning = False
@@ -248,7 +337,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         """
         self._eyedropper_mode = True
         self._eyedropper_callback = callback
-        self.config(cursor='crosshair')
+        self._set_cursor('crosshair')
     
     def disable_eyedropper(self) -> None:
         """Disable eyedropper mode."""
@@ -277,6 +366,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             config: New grid configuration.
         """
         self.grid_config = config
+        self._invalidate_cache()
         self.redraw()
     
     def reset_to_uniform(self, cell_size: int, offset_x: int = 0, offset_y: int = 0) -> None:
@@ -298,35 +388,28 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             offset_x,
             offset_y
         )
+        self._invalidate_cache()
         self._notify_change()
         self.redraw()
     
     def select_all_cells(self) -> None:
         """Mark all cells as included."""
-        self.grid_config.excluded_cells.clear()
+        state = self.grid_config.state
+        state[state == CELL_EXCLUDED] = CELL_NEUTRAL
         self._notify_change()
         self.redraw()
     
     def deselect_all_cells(self) -> None:
         """Mark all cells as excluded."""
-        self.grid_config.included_cells.clear()
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                self.grid_config.excluded_cells.add((col, row))
+        self.grid_config.state[:] = CELL_EXCLUDED
         self._notify_change()
         self.redraw()
     
     def invert_selection(self) -> None:
         """Invert the exclusion state of all cells."""
-        all_cells = set()
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                all_cells.add((col, row))
-        
-        # Swap excluded and non-excluded
-        new_excluded = all_cells - self.grid_config.excluded_cells
-        self.grid_config.excluded_cells = new_excluded
-        self.grid_config.included_cells.clear()
+        # Swap excluded and non-excluded, dropping manual inclusions
+        state = self.grid_config.state
+        state[:] = np.where(state == CELL_EXCLUDED, CELL_NEUTRAL, CELL_EXCLUDED)
         self._notify_change()
         self.redraw()
     
@@ -335,6 +418,46 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         if self.on_grid_changed:
             self.on_grid_changed(self.grid_config)
     
+    def _invalidate_cache(self) -> None:
+        """Drop geometry cached from the grid lines. Call whenever they change."""
+        self._centers = None
+        self._color_mask_cache = None
+        self._contour_cache = None
+        self._screen_lines = None
+    
+    def _cell_centers(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the cached (centers_x, centers_y) arrays of the grid."""
+        if self._centers is None:
+            self._centers = self.grid_config.cell_centers()
+        return self._centers
+    
+    def _line_screen_positions(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the screen positions of the vertical and horizontal lines.
+        
+        Cached for the current zoom and image position, and dropped by
+        _invalidate_cache when the lines themselves move.
+        """
+        key = (self.zoom_level, self.img_x, self.img_y)
+        if self._screen_lines is None or self._screen_lines[0] != key:
+            # Truncated like image_to_screen
+            line_sx = self.img_x + (self.grid_config.x_lines * self.zoom_level).astype(np.int64)
+            line_sy = self.img_y + (self.grid_config.y_lines * self.zoom_level).astype(np.int64)
+            self._screen_lines = (key, line_sx, line_sy)
+        return self._screen_lines[1], self._screen_lines[2]
+    
+    def _area_mask(self) -> np.ndarray:
+        """Boolean (num_rows, num_cols) mask of cells centered in the area selection."""
+        centers_x, centers_y = self._cell_centers()
+        x1 = min(self._area_start[0], self._area_end[0])
+        y1 = min(self._area_start[1], self._area_end[1])
+        x2 = max(self._area_start[0], self._area_end[0])
+        y2 = max(self._area_start[1], self._area_end[1])
+        
+        in_x = (centers_x >= x1) & (centers_x <= x2)
+        in_y = (centers_y >= y1) & (centers_y <= y2)
+        return in_y[:, None] & in_x[None, :]
+    
     def get_cells_in_area(self) -> list[tuple[int, int]]:
         """
         Get all cells that are within the current area selection.
@@ -345,20 +468,8 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         if self._area_start is None or self._area_end is None:
             return []
         
-        # Get the selection bounds in image coordinates
-        x1 = min(self._area_start[0], self._area_end[0])
-        y1 = min(self._area_start[1], self._area_end[1])
-        x2 = max(self._area_start[0], self._area_end[0])
-        y2 = max(self._area_start[1], self._area_end[1])
-        
-        cells = []
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                cx, cy = self.grid_config.get_cell_center(col, row)
-                if x1 <= cx <= x2 and y1 <= cy <= y2:
-                    cells.append((col, row))
-        
-        return cells
+        cols, rows = np.nonzero(self._area_mask().T)
+        return list(zip(cols.tolist(), rows.tolist()))
     
     def include_cells_in_selection(self) -> int:
         """
@@ -367,12 +478,13 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         Returns:
             Number of cells that were changed.
         """
-        cells = self.get_cells_in_area()
-        changed = 0
-        for col, row in cells:
-            if (col, row) in self.grid_config.excluded_cells:
-                self.grid_config.excluded_cells.remove((col, row))
-                changed += 1
+        if self._area_start is None or self._area_end is None:
+            return 0
+        
+        state = self.grid_config.state
+        target = self._area_mask() & (state == CELL_EXCLUDED)
+        state[target] = CELL_NEUTRAL
+        changed = int(target.sum())
         
         if changed:
             self._notify_change()
@@ -386,13 +498,13 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         Returns:
             Number of cells that were changed.
         """
-        cells = self.get_cells_in_area()
-        changed = 0
-        for col, row in cells:
-            if (col, row) not in self.grid_config.excluded_cells:
-                self.grid_config.excluded_cells.add((col, row))
-                self.grid_config.included_cells.discard((col, row))
-                changed += 1
+        if self._area_start is None or self._area_end is None:
+            return 0
+        
+        state = self.grid_config.state
+        target = self._area_mask() & (state != CELL_EXCLUDED)
+        state[target] = CELL_EXCLUDED
+        changed = int(target.sum())
         
         if changed:
             self._notify_change()
@@ -414,34 +526,61 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
     # CONTOUR SELECTION METHODS
     # =========================================================================
     
-    def _point_in_polygon(self, x: int, y: int, polygon: list[tuple[int, int]]) -> bool:
+    def _grid_in_polygon(
+        self,
+        centers_x: np.ndarray,
+        centers_y: np.ndarray,
+        polygon: list[tuple[int, int]]
+    ) -> np.ndarray:
         """
-        Check if a point is inside a polygon using ray casting algorithm.
+        Check which grid points are inside a polygon, one scanline per row.
+        
+        Each row's edge crossings are computed once and sorted; a point is
+        inside when an odd number of them lie to its right (ray casting).
         
         Args:
-            x, y: Point coordinates
+            centers_x: X coordinate of every column
+            centers_y: Y coordinate of every row
             polygon: List of (x, y) vertex coordinates
             
         Returns:
-            True if point is inside the polygon.
+            Boolean (len(centers_y), len(centers_x)) array, True inside.
         """
+        inside = np.zeros((len(centers_y), len(centers_x)), dtype=bool)
         n = len(polygon)
         if n < 3:
-            return False
+            return inside
         
-        inside = False
-        j = n - 1
+        # Edge k runs from vertex k - 1 to vertex k
+        vertices = np.asarray(polygon, dtype=np.int64)
+        xi, yi = vertices[:, 0], vertices[:, 1]
+        xj, yj = np.roll(xi, 1), np.roll(yi, 1)
         
-        for i in range(n):
-            xi, yi = polygon[i]
-            xj, yj = polygon[j]
-            
-            if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi) + xi):
-                inside = not inside
-            j = i
+        y = centers_y[:, None].astype(np.int64)
+        spans = (yi > y) != (yj > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossings = (xj - xi) * (y - yi) / (yj - yi) + xi
+        crossings = np.where(spans, crossings, -np.inf)
+        crossings.sort(axis=1)
+        
+        for row in np.flatnonzero(spans.any(axis=1)):
+            right = n - np.searchsorted(crossings[row], centers_x, side='right')
+            inside[row] = right % 2 == 1
         
         return inside
     
+    def _contour_mask(self) -> np.ndarray:
+        """Boolean (num_rows, num_cols) mask of cells centered inside the closed contour."""
+        centers_x, centers_y = self._cell_centers()
+        if not self._contour_closed:
+            return np.zeros((len(centers_y), len(centers_x)), dtype=bool)
+        
+        key = tuple(self._contour_points)
+        if self._contour_cache is None or self._contour_cache[0] != key:
+            mask = self._grid_in_polygon(centers_x, centers_y, self._contour_points)
+            self._contour_cache = (key, mask)
+        return self._contour_cache[1]
+    
     def get_cells_in_contour(self) -> list[tuple[int, int]]:
         """
         Get all cells whose centers are inside the current contour polygon.
@@ -449,17 +588,8 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         Returns:
             List of (col, row) tuples for cells inside the contour.
         """
-        if not self._contour_closed or len(self._contour_points) < 3:
-            return []
-        
-        cells = []
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                cx, cy = self.grid_config.get_cell_center(col, row)
-                if self._point_in_polygon(cx, cy, self._contour_points):
-                    cells.append((col, row))
-        
-        return cells
+        cols, rows = np.nonzero(self._contour_mask().T)
+        return list(zip(cols.tolist(), rows.tolist()))
     
     def include_cells_in_contour(self) -> int:
         """
@@ -468,12 +598,10 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         Returns:
             Number of cells that were changed.
         """
-        cells = self.get_cells_in_contour()
-        changed = 0
-        for col, row in cells:
-            if (col, row) in self.grid_config.excluded_cells:
-                self.grid_config.excluded_cells.remove((col, row))
-                changed += 1
+        state = self.grid_config.state
+        target = self._contour_mask() & (state == CELL_EXCLUDED)
+        state[target] = CELL_NEUTRAL
+        changed = int(target.sum())
         
         if changed:
             self._notify_change()
@@ -487,16 +615,10 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         Returns:
             Number of cells that were changed.
         """
-        cells_inside = set(self.get_cells_in_contour())
-        changed = 0
-        
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                if (col, row) not in cells_inside:
-                    if (col, row) not in self.grid_config.excluded_cells:
-                        self.grid_config.excluded_cells.add((col, row))
-                        self.grid_config.included_cells.discard((col, row))
-                        changed += 1
+        state = self.grid_config.state
+        target = ~self._contour_mask() & (state != CELL_EXCLUDED)
+        state[target] = CELL_EXCLUDED
+        changed = int(target.sum())
         
         if changed:
             self._notify_change()
@@ -569,51 +691,48 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         """Check if a pixel has been defined."""
         return self._pixel_start is not None and self._pixel_end is not None
     
+    def _set_cursor(self, cursor: str) -> None:
+        """Set the canvas cursor, skipping the Tk call if it is unchanged."""
+        if cursor != self._current_cursor:
+            self._current_cursor = cursor
+            self.config(cursor=cursor)
+    
     def _update_cursor(self) -> None:
         """Update cursor based on mode and hover state."""
-        if self.mode == EditorMode.PAN_ZOOM:
-            self.config(cursor='')
-        elif self.mode == EditorMode.SELECT_CELLS:
-            self.config(cursor='hand2')
-        elif self.mode == EditorMode.AREA_SELECT:
-            self.config(cursor='cross')
-        elif self.mode == EditorMode.CONTOUR_SELECT:
-            self.config(cursor='pencil')
-        elif self.mode == EditorMode.DEFINE_PIXEL:
-            self.config(cursor='tcross')
-        elif self.mode == EditorMode.ADJUST_GRID:
-            if self._hover_line:
-                target, _ = self._hover_line
-                if target == DragTarget.V_LINE:
-                    self.config(cursor='sb_h_double_arrow')
-                elif target == DragTarget.H_LINE:
-                    self.config(cursor='sb_v_double_arrow')
-                elif target == DragTarget.CORNER:
-                    self.config(cursor='fleur')
-            else:
-                self.config(cursor='crosshair')
+        if self.mode == EditorMode.ADJUST_GRID:
+            target = self._hover_line[0] if self._hover_line else DragTarget.NONE
+            self._set_cursor(_GRID_CURSORS.get(target, 'crosshair'))
+        else:
+            self._set_cursor(_MODE_CURSORS.get(self.mode, ''))
     
     def redraw(self) -> None:
         """Redraw canvas with grid overlay."""
         if self.image is None:
             return
         
-        self.delete("all")
-        
         # Draw base image
         img_w, img_h = self.image.size
         new_w = max(1, int(img_w * self.zoom_level))
         new_h = max(1, int(img_h * self.zoom_level))
         
-        resized = self.image.resize((new_w, new_h), Image.Resampling.NEAREST)
-        self.photo = ImageTk.PhotoImage(resized)
+        self.img_x = (self._canvas_w - new_w) // 2 + self.offset_x
+        self.img_y = (self._canvas_h - new_h) // 2 + self.offset_y
+        
+        self._draw_image(new_w, new_h)
+        self._refresh_overlays()
+    
+    def _refresh_overlays(self) -> None:
+        """
+        Redraw only the interactive items above the image.
         
-        canvas_w = self.winfo_width()
-        canvas_h = self.winfo_height()
-        self.img_x = (canvas_w - new_w) // 2 + self.offset_x
-        self.img_y = (canvas_h - new_h) // 2 + self.offset_y
+        Hover, selection and info items are cheap Tk shapes; the image item
+        and its baked-in grid overlay are left untouched.
+        """
+        if self.image is None:
+            return
         
-        self.create_image(self.img_x, self.img_y, anchor=tk.NW, image=self.photo)
+        self._overlay_pending = False
+        self.delete(*_OVERLAY_TAGS)
         
         # Draw grid
         self._draw_grid()
@@ -633,155 +752,269 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         # Draw info
         self._draw_info_text()
     
+    def _request_overlay_refresh(self) -> None:
+        """
+        Schedule _refresh_overlays for when Tk is idle.
+        
+        For changes that only move Tk items (pixel definition, open
+        contour); anything baked into the image needs _request_redraw.
+        """
+        if not (self._overlay_pending or self._redraw_pending):
+            self._overlay_pending = True
+            self.after_idle(self._do_pending_overlay_refresh)
+    
+    def _do_pending_overlay_refresh(self) -> None:
+        """Run the refresh scheduled by _request_overlay_refresh, unless a redraw did it."""
+        if self._overlay_pending:
+            self._refresh_overlays()
+    
+    def _update_photo(
+        self, 
+        new_w: int, 
+        new_h: int, 
+        box: tuple[int, int, int, int]
+    ) -> None:
+        """
+        Rebuild the display PhotoImage with the grid overlay baked in.
+        
+        Grid lines, cell tints and center markers are part of the image
+        rather than one canvas item each, so they are only re-rendered
+        when the view or the grid state changes.
+        """
+        key = (id(self.image), new_w, new_h, box, self._overlay_key())
+        if self.photo is None or key != self._photo_key:
+            base = self._zoomed_image(new_w, new_h, box).convert('RGBA')
+            overlay = Image.fromarray(self._grid_overlay(box))
+            self._set_photo(Image.alpha_composite(base, overlay))
+            self._photo_key = key
+    
+    def _overlay_key(self) -> tuple:
+        """Get a hashable snapshot of everything the grid overlay depends on."""
+        tinted = self.mode in (EditorMode.SELECT_CELLS, EditorMode.AREA_SELECT)
+        area = self.mode == EditorMode.AREA_SELECT and self.has_area_selection()
+        contour = self.mode == EditorMode.CONTOUR_SELECT and self._contour_closed
+        return (
+            self.zoom_level,
+            self.grid_config.x_lines.tobytes(),
+            self.grid_config.y_lines.tobytes(),
+            self.grid_config.state.tobytes(),
+            self.mode if tinted or contour else None,
+            (self._area_start, self._area_end) if area else None,
+            tuple(self._contour_points) if contour else None,
+            tuple(self.excluded_colors),
+            self.color_tolerance,
+        )
+    
+    def _grid_overlay(self, box: tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Render grid lines, cell tints and center markers for the visible box.
+        
+        Args:
+            box: Visible part of the zoomed image (x1, y1, x2, y2).
+        
+        Returns:
+            RGBA array of the box's size, in screen pixels.
+        """
+        bx1, by1, bx2, by2 = box
+        width, height = bx2 - bx1, by2 - by1
+        overlay = np.zeros((height, width, 4), dtype=np.uint8)
+        
+        config = self.grid_config
+        if len(config.x_lines) == 0 or len(config.y_lines) == 0:
+            return overlay
+        
+        # Line positions relative to the box, truncated like image_to_screen
+        xs = (config.x_lines * self.zoom_level).astype(np.int64) - bx1
+        ys = (config.y_lines * self.zoom_level).astype(np.int64) - by1
+        
+        # Cell tints: look up every screen pixel's cell once
+        tint = None
+        if self.mode in (EditorMode.SELECT_CELLS, EditorMode.AREA_SELECT):
+            tint = np.zeros((config.num_rows, config.num_cols, 4), dtype=np.uint8)
+            if self.mode == EditorMode.AREA_SELECT and self.has_area_selection():
+                tint[self._area_mask()] = GRID_EDITOR.cell_area_overlay
+            tint[config.excluded_mask()] = GRID_EDITOR.cell_excluded_overlay
+        elif self.mode == EditorMode.CONTOUR_SELECT and self._contour_closed:
+            tint = np.zeros((config.num_rows, config.num_cols, 4), dtype=np.uint8)
+            tint[self._contour_mask()] = GRID_EDITOR.cell_contour_overlay
+        
+        if tint is not None and tint.size:
+            col_of = np.searchsorted(xs, np.arange(width), side='right') - 1
+            row_of = np.searchsorted(ys, np.arange(height), side='right') - 1
+            valid_c = (col_of >= 0) & (col_of < config.num_cols)
+            valid_r = (row_of >= 0) & (row_of < config.num_rows)
+            overlay[np.ix_(valid_r, valid_c)] = tint[np.ix_(row_of[valid_r], col_of[valid_c])]
+        
+        # Grid lines, centered on their position like Tk line items. Lines on
+        # the right and bottom image edges land one pixel past the zoomed
+        # image, so pull them onto its last pixel to keep the border visible.
+        img_w, img_h = self.image.size
+        line_xs = np.minimum(xs, max(1, int(img_w * self.zoom_level)) - 1 - bx1)
+        line_ys = np.minimum(ys, max(1, int(img_h * self.zoom_level)) - 1 - by1)
+        color = (*ImageColor.getrgb(GRID_EDITOR.line_color_normal), 255)
+        line_w = GRID_EDITOR.line_width_normal
+        for shift in range(-(line_w // 2), line_w - line_w // 2):
+            cols = line_xs + shift
+            rows = line_ys + shift
+            overlay[:, cols[(cols >= 0) & (cols < width)]] = color
+            overlay[rows[(rows >= 0) & (rows < height)], :] = color
+        
+        self._draw_center_markers(overlay, box)
+        return overlay
+    
+    def _draw_center_markers(self, overlay: np.ndarray, box: tuple[int, int, int, int]) -> None:
+        """
+        Draw a small mark at every cell center into the overlay.
+        
+        Excluded cells get an X (red if manual, orange if by color), the
+        rest a discrete green cross that does not obscure the image.
+        
+        Args:
+            overlay: RGBA array of the visible box, modified in place.
+            box: Visible part of the zoomed image (x1, y1, x2, y2).
+        """
+        config = self.grid_config
+        if not self._markers_visible():
+            return
+        
+        height, width = overlay.shape[:2]
+        r = max(2, int(2 * self.zoom_level))
+        centers_x, centers_y = self._cell_centers()
+        screen_x = (centers_x * self.zoom_level).astype(np.int64) - box[0]
+        screen_y = (centers_y * self.zoom_level).astype(np.int64) - box[1]
+        
+        # Cull to the cells whose marks reach the visible box (centers are sorted)
+        c0, c1 = np.searchsorted(screen_x, [-r, width + r])
+        r0, r1 = np.searchsorted(screen_y, [-r, height + r])
+        if c0 >= c1 or r0 >= r1:
+            return
+        screen_x = screen_x[c0:c1]
+        screen_y = screen_y[r0:r1]
+        
+        excluded = config.excluded_mask()[r0:r1, c0:c1]
+        included = config.included_mask()[r0:r1, c0:c1]
+        color_excluded = self._color_excluded_cells()[r0:r1, c0:c1] & ~excluded
+        neutral = ~(excluded | color_excluded)
+        
+        # Pixel offsets of each mark, as Tk rasterizes a 1px line without its end point
+        t = np.arange(-r, r)
+        zero = np.zeros_like(t)
+        x_mark = (np.concatenate([t, -t]), np.concatenate([t, t]))
+        cross = (np.concatenate([t, zero]), np.concatenate([zero, t]))
+        
+        marks = (
+            (excluded, '#ff4444', x_mark),
+            (color_excluded, '#ff9944', x_mark),
+            (neutral & ~included, '#44cc44', cross),
+            (neutral & included, '#88ff88', cross),
+        )
+        for mask, color, (dx, dy) in marks:
+            rows, cols = np.nonzero(mask)
+            if len(rows) == 0:
+                continue
+            xs = (screen_x[cols][:, None] + dx).ravel()
+            ys = (screen_y[rows][:, None] + dy).ravel()
+            valid = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            overlay[ys[valid], xs[valid]] = (*ImageColor.getrgb(color), 255)
+    
     def _draw_grid(self) -> None:
-        """Draw grid lines."""
-        if not self.grid_config.x_lines or not self.grid_config.y_lines:
+        """Draw the hovered grid line; the others are part of the overlay image."""
+        if len(self.grid_config.x_lines) == 0 or len(self.grid_config.y_lines) == 0:
             return
         
         # Get image bounds on screen
         img_w, img_h = self.image.size
         
-        # Draw vertical lines
-        for i, x in enumerate(self.grid_config.x_lines):
-            sx = self.img_x + int(x * self.zoom_level)
-            sy1 = self.img_y
-            sy2 = self.img_y + int(img_h * self.zoom_level)
+        # Regular lines are part of the overlay image; only hover is an item
+        if self._hover_line:
+            target, idx = self._hover_line
+            color = GRID_EDITOR.line_color_hover
+            width = GRID_EDITOR.line_width_hover
             
-            # Check if hovering
-            is_hover = (self._hover_line and 
-                       self._hover_line[0] in (DragTarget.V_LINE, DragTarget.CORNER) and 
-                       self._hover_line[1] == i)
+            line_sx, line_sy = self._line_screen_positions()
+            if target == DragTarget.CORNER:
+                v_idx, h_idx = idx
+            else:
+                v_idx = h_idx = idx
             
-            color = GRID_EDITOR.line_color_hover if is_hover else GRID_EDITOR.line_color_normal
-            width = GRID_EDITOR.line_width_hover if is_hover else GRID_EDITOR.line_width_normal
+            if target in (DragTarget.V_LINE, DragTarget.CORNER) and 0 <= v_idx < len(line_sx):
+                sx = int(line_sx[v_idx])
+                sy1 = self.img_y
+                sy2 = self.img_y + int(img_h * self.zoom_level)
+                self.create_line(sx, sy1, sx, sy2, fill=color, width=width, tags='grid_line')
             
-            self.create_line(sx, sy1, sx, sy2, fill=color, width=width, tags='grid_line')
+            if target in (DragTarget.H_LINE, DragTarget.CORNER) and 0 <= h_idx < len(line_sy):
+                sy = int(line_sy[h_idx])
+                sx1 = self.img_x
+                sx2 = self.img_x + int(img_w * self.zoom_level)
+                self.create_line(sx1, sy, sx2, sy, fill=color, width=width, tags='grid_line')
+    
+    def _markers_visible(self) -> bool:
+        """Check if cells are large enough on screen for center markers to be legible."""
+        config = self.grid_config
+        if config.num_cols == 0 or config.num_rows == 0:
+            return False
         
-        # Draw horizontal lines
-        for i, y in enumerate(self.grid_config.y_lines):
-            sy = self.img_y + int(y * self.zoom_level)
-            sx1 = self.img_x
-            sx2 = self.img_x + int(img_w * self.zoom_level)
-            
-            is_hover = (self._hover_line and 
-                       self._hover_line[0] in (DragTarget.H_LINE, DragTarget.CORNER) and 
-                       self._hover_line[1] == i)
-            
-            color = GRID_EDITOR.line_color_hover if is_hover else GRID_EDITOR.line_color_normal
-            width = GRID_EDITOR.line_width_hover if is_hover else GRID_EDITOR.line_width_normal
+        # Median, so a thin remainder cell at the edge doesn't hide every marker
+        cell = min(np.median(np.diff(config.x_lines)), np.median(np.diff(config.y_lines)))
+        return cell * self.zoom_level >= GRID_EDITOR.min_marker_cell_px
+    
+    def _color_excluded_cells(self) -> np.ndarray:
+        """
+        Find the cells whose center color matches an excluded color.
+        
+        The mask is cached until the image, the grid lines, the excluded
+        colors or the tolerance change; cell state and hover don't affect it.
+        
+        Returns:
+            Boolean (num_rows, num_cols) mask
+        """
+        key = (tuple(self.excluded_colors), self.color_tolerance)
+        cache = self._color_mask_cache
+        if cache is not None and cache[0] is self.image and cache[1] == key:
+            return cache[2]
+        
+        centers_x, centers_y = self._cell_centers()
+        mask = np.zeros((len(centers_y), len(centers_x)), dtype=bool)
+        colors = [c for c in self.excluded_colors if c is not None]
+        if self.image and colors:
+            rgb = self.rgb_array()
+            h, w = rgb.shape[:2]
+            sample_y = np.clip(centers_y, 0, h - 1)
+            sample_x = np.clip(centers_x, 0, w - 1)
+            pixels = rgb[sample_y[:, None], sample_x[None, :]].astype(np.int16)
             
-            self.create_line(sx1, sy, sx2, sy, fill=color, width=width, tags='grid_line')
-        
-        # Draw center markers
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                cx, cy = self.grid_config.get_cell_center(col, row)
-                scx = self.img_x + int(cx * self.zoom_level)
-                scy = self.img_y + int(cy * self.zoom_level)
-                
-                # Small cross at center (discrete, doesn't obscure image)
-                r = max(2, int(2 * self.zoom_level))
-                
-                # Check if manually excluded
-                is_manually_excluded = self.grid_config.is_cell_excluded(col, row)
-                
-                # Check if color-excluded
-                is_color_excluded = False
-                if self.image and not is_manually_excluded:
-                    # Sample the center color
-                    sample_x = max(0, min(cx, self.image.size[0] - 1))
-                    sample_y = max(0, min(cy, self.image.size[1] - 1))
-                    pixel_color = self.image.getpixel((sample_x, sample_y))[:3]
-                    
-                    # Check against excluded colors
-                    for exc_color in self.excluded_colors:
-                        if exc_color is not None:
-                            # Simple tolerance check
-                            diff = sum(abs(a - b) for a, b in zip(pixel_color, exc_color))
-                            if diff <= self.color_tolerance * 3:
-                                is_color_excluded = True
-                                break
-                
-                if is_manually_excluded:
-                    # X mark for manually excluded (red)
-                    self.create_line(
-                        scx - r, scy - r, scx + r, scy + r,
-                        fill='#ff4444', width=1
-                    )
-                    self.create_line(
-                        scx + r, scy - r, scx - r, scy + r,
-                        fill='#ff4444', width=1
-                    )
-                elif is_color_excluded:
-                    # X mark for color-excluded (orange)
-                    self.create_line(
-                        scx - r, scy - r, scx + r, scy + r,
-                        fill='#ff9944', width=1
-                    )
-                    self.create_line(
-                        scx + r, scy - r, scx - r, scy + r,
-                        fill='#ff9944', width=1
-                    )
-                else:
-                    # Small + cross for included (discrete green)
-                    color = '#88ff88' if self.grid_config.is_cell_included(col, row) else '#44cc44'
-                    self.create_line(
-                        scx - r, scy, scx + r, scy,
-                        fill=color, width=1
-                    )
-                    self.create_line(
-                        scx, scy - r, scx, scy + r,
-                        fill=color, width=1
-                    )
+            # Sum of per-channel differences, as in the single-pixel check
+            exc = np.array(colors, dtype=np.int16)
+            diff = np.abs(pixels[None] - exc[:, None, None, :]).sum(axis=-1)
+            mask = (diff <= self.color_tolerance * 3).any(axis=0)
+        
+        self._color_mask_cache = (self.image, key, mask)
+        return mask
     
     def _draw_cell_overlays(self) -> None:
-        """Draw semi-transparent overlays on cells."""
-        if self.mode not in (EditorMode.SELECT_CELLS, EditorMode.AREA_SELECT):
+        """Draw the hover highlight; area and exclusion tints are in the overlay image."""
+        if self.mode != EditorMode.SELECT_CELLS or self._hover_cell is None:
             return
         
-        # Get cells in area selection for highlighting
-        cells_in_area = set(self.get_cells_in_area()) if self.mode == EditorMode.AREA_SELECT else set()
+        col, row = self._hover_cell
+        if not self.grid_config.in_grid(col, row):
+            return
         
-        for col in range(self.grid_config.num_cols):
-            for row in range(self.grid_config.num_rows):
-                x1, y1, x2, y2 = self.grid_config.get_cell_bounds(col, row)
-                
-                sx1 = self.img_x + int(x1 * self.zoom_level)
-                sy1 = self.img_y + int(y1 * self.zoom_level)
-                sx2 = self.img_x + int(x2 * self.zoom_level)
-                sy2 = self.img_y + int(y2 * self.zoom_level)
-                
-                # Hover highlight (SELECT_CELLS mode)
-                if self._hover_cell == (col, row) and self.mode == EditorMode.SELECT_CELLS:
-                    self.create_rectangle(
-                        sx1, sy1, sx2, sy2,
-                        fill='#ffff00', 
-                        stipple='gray50',
-                        outline='#ffff00',
-                        width=2,
-                        tags='cell_hover'
-                    )
-                
-                # Area selection highlight (AREA_SELECT mode)
-                if (col, row) in cells_in_area:
-                    self.create_rectangle(
-                        sx1, sy1, sx2, sy2,
-                        fill='#00aaff', 
-                        stipple='gray50',
-                        outline='#00aaff',
-                        width=1,
-                        tags='cell_area'
-                    )
-                
-                # Exclusion overlay
-                if self.grid_config.is_cell_excluded(col, row):
-                    self.create_rectangle(
-                        sx1, sy1, sx2, sy2,
-                        fill='#ff0000',
-                        stipple='gray25',
-                        outline='',
-                        tags='cell_excluded'
-                    )
+        x1, y1, x2, y2 = self.grid_config.get_cell_bounds(col, row)
+        sx1 = self.img_x + int(x1 * self.zoom_level)
+        sy1 = self.img_y + int(y1 * self.zoom_level)
+        sx2 = self.img_x + int(x2 * self.zoom_level)
+        sy2 = self.img_y + int(y2 * self.zoom_level)
+        
+        self.create_rectangle(
+            sx1, sy1, sx2, sy2,
+            fill='#ffff00', 
+            stipple='gray50',
+            outline='#ffff00',
+            width=2,
+            tags='cell_hover'
+        )
     
     def _draw_area_selection(self) -> None:
         """Draw the area selection rectangle."""
@@ -850,25 +1083,6 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
                 width=2,
                 tags='contour_vertex'
             )
-        
-        # Highlight cells inside closed contour
-        if self._contour_closed:
-            cells_inside = self.get_cells_in_contour()
-            for col, row in cells_inside:
-                x1, y1, x2, y2 = self.grid_config.get_cell_bounds(col, row)
-                sx1 = self.img_x + int(x1 * self.zoom_level)
-                sy1 = self.img_y + int(y1 * self.zoom_level)
-                sx2 = self.img_x + int(x2 * self.zoom_level)
-                sy2 = self.img_y + int(y2 * self.zoom_level)
-                
-                self.create_rectangle(
-                    sx1, sy1, sx2, sy2,
-                    fill='#ff00ff',
-                    stipple='gray50',
-                    outline='#ff00ff',
-                    width=1,
-                    tags='cell_contour'
-                )
     
     def _draw_pixel_definition(self) -> None:
         """Draw the pixel definition rectangle."""
@@ -925,7 +1139,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         
         cols = self.grid_config.num_cols
         rows = self.grid_config.num_rows
-        excluded = len(self.grid_config.excluded_cells)
+        excluded = int(self.grid_config.excluded_mask().sum())
         
         # Add area selection info
         area_info = ""
@@ -937,7 +1151,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         if self.mode == EditorMode.CONTOUR_SELECT:
             pts = len(self._contour_points)
             if self._contour_closed:
-                cells_inside = len(self.get_cells_in_contour())
+                cells_inside = int(self._contour_mask().sum())
                 area_info = f" | Cerrado: {cells_inside} celdas"
             elif pts > 0:
                 area_info = f" | Puntos: {pts}"
@@ -956,15 +1170,10 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             f"Zoom: {zoom_pct}% | {mode_text}",
             f"Grid: {cols}×{rows} | Excluidas: {excluded}{area_info}"
         ]
+        if cols and rows and not self._markers_visible():
+            info_lines.append("Celdas muy pequeñas: acerca el zoom para ver las marcas")
         
-        for i, line in enumerate(info_lines):
-            self.create_text(
-                10, 10 + i * 18,
-                text=line,
-                fill=UI_COLORS.accent_green,
-                anchor=tk.NW,
-                font=('Segoe UI', 9)
-            )
+        self._show_info_lines(info_lines)
     
     def _find_nearest_line(self, sx: int, sy: int) -> tuple[DragTarget, int] | None:
         """
@@ -972,31 +1181,56 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         
         Returns:
             Tuple of (target_type, line_index) or None if not near any line.
+            For corners the index is a (v_index, h_index) pair.
         """
         if self.image is None:
             return None
         
         grab_dist = GRID_EDITOR.line_grab_distance
         
-        # Check vertical lines
-        for i, x in enumerate(self.grid_config.x_lines):
-            line_sx = self.img_x + int(x * self.zoom_level)
-            if abs(sx - line_sx) <= grab_dist:
-                # Also check if near a horizontal line (corner)
-                for j, y in enumerate(self.grid_config.y_lines):
-                    line_sy = self.img_y + int(y * self.zoom_level)
-                    if abs(sy - line_sy) <= grab_dist:
-                        return (DragTarget.CORNER, i * 1000 + j)  # Encode both indices
-                return (DragTarget.V_LINE, i)
-        
-        # Check horizontal lines
-        for i, y in enumerate(self.grid_config.y_lines):
-            line_sy = self.img_y + int(y * self.zoom_level)
-            if abs(sy - line_sy) <= grab_dist:
-                return (DragTarget.H_LINE, i)
+        line_sx, line_sy = self._line_screen_positions()
+        if len(line_sx) == 0 or len(line_sy) == 0:
+            return None
+        
+        # Most positions are nowhere near the grid: reject outside its bounding box
+        if not (line_sx[0] - grab_dist <= sx <= line_sx[-1] + grab_dist
+                and line_sy[0] - grab_dist <= sy <= line_sy[-1] + grab_dist):
+            return None
+        
+        i = self._nearest_line_index(line_sx, sx, grab_dist)
+        j = self._nearest_line_index(line_sy, sy, grab_dist)
+        
+        if i is not None and j is not None:
+            return (DragTarget.CORNER, (i, j))
+        if i is not None:
+            return (DragTarget.V_LINE, i)
+        if j is not None:
+            return (DragTarget.H_LINE, j)
         
         return None
     
+    @staticmethod
+    def _nearest_line_index(line_pos: np.ndarray, pos: int, grab_dist: int) -> int | None:
+        """
+        Find the line closest to a screen position by binary search.
+        
+        Args:
+            line_pos: Sorted screen positions of the lines on one axis.
+            pos: Screen position to test.
+            grab_dist: Maximum distance in screen pixels.
+        
+        Returns:
+            Index of the closest line within grab_dist, or None.
+        """
+        i = int(np.searchsorted(line_pos, pos))
+        best = None
+        for k in (i - 1, i):  # Only the neighbours of pos can be closest
+            if 0 <= k < len(line_pos):
+                dist = abs(int(line_pos[k]) - pos)
+                if dist <= grab_dist and (best is None or dist < best[0]):
+                    best = (dist, k)
+        return None if best is None else best[1]
+    
     def _find_cell_at(self, sx: int, sy: int) -> tuple[int, int] | None:
         """
         Find which cell contains the screen coordinates.
@@ -1011,26 +1245,21 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         ix = int((sx - self.img_x) / self.zoom_level)
         iy = int((sy - self.img_y) / self.zoom_level)
         
-        # Find column
-        col = -1
-        for i in range(len(self.grid_config.x_lines) - 1):
-            if self.grid_config.x_lines[i] <= ix < self.grid_config.x_lines[i + 1]:
-                col = i
-                break
-        
-        # Find row
-        row = -1
-        for i in range(len(self.grid_config.y_lines) - 1):
-            if self.grid_config.y_lines[i] <= iy < self.grid_config.y_lines[i + 1]:
-                row = i
-                break
-        
-        if col >= 0 and row >= 0:
-            return (col, row)
-        return None
+        return self.grid_config.hit_cell(ix, iy)
     
     def _on_motion(self, event: tk.Event) -> None:
-        """Handle mouse motion."""
+        """Queue mouse motion; a burst of events is handled once when Tk is idle."""
+        if self._pending_motion is None:
+            self.after_idle(self._flush_motion)
+        self._pending_motion = event
+    
+    def _flush_motion(self) -> None:
+        """Update the hover state from the latest queued mouse motion."""
+        event = self._pending_motion
+        self._pending_motion = None
+        if event is None:
+            return
+        
         if self.mode == EditorMode.ADJUST_GRID:
             # Update hover state
             old_hover = self._hover_line
@@ -1038,7 +1267,9 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             
             if old_hover != self._hover_line:
                 self._update_cursor()
-                self.redraw()
+                # Only the hovered line item changes
+                self.delete('grid_line')
+                self._draw_grid()
         
         elif self.mode == EditorMode.SELECT_CELLS:
             # Update hover cell
@@ -1046,7 +1277,9 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             self._hover_cell = self._find_cell_at(event.x, event.y)
             
             if old_hover != self._hover_cell:
-                self.redraw()
+                # Only the hover rectangle changes
+                self.delete('cell_hover')
+                self._draw_cell_overlays()
     
     def _on_press(self, event: tk.Event) -> None:
         """Handle mouse press."""
@@ -1054,7 +1287,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         if self._eyedropper_mode and self.image:
             ix, iy = self.screen_to_image(event.x, event.y)
             if 0 <= ix < self.image.size[0] and 0 <= iy < self.image.size[1]:
-                color = self.image.getpixel((ix, iy))[:3]
+                color = self.pick_color(ix, iy)
                 if self._eyedropper_callback:
                     self._eyedropper_callback(color)
             self.disable_eyedropper()
@@ -1063,7 +1296,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
         if self.mode == EditorMode.PAN_ZOOM:
             self._panning = True
             self._pan_start = (event.x, event.y)
-            self.config(cursor='fleur')
+            self._set_cursor('fleur')
         
         elif self.mode == EditorMode.ADJUST_GRID:
             line = self._find_nearest_line(event.x, event.y)
@@ -1071,19 +1304,29 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
                 self._drag_target, self._drag_line_index = line[0], line[1]
                 self._drag_start_pos = (event.x, event.y)
                 
-                # Store original value(s)
+                # Store original value(s) and clamp ranges; neighbours don't move during the drag
+                x_lines, y_lines = self.grid_config.x_lines, self.grid_config.y_lines
                 if self._drag_target == DragTarget.V_LINE:
                     idx = self._drag_line_index
-                    if 0 < idx < len(self.grid_config.x_lines) - 1:
-                        self._drag_original_value = self.grid_config.x_lines[idx]
+                    self._drag_original_value = int(x_lines[idx])
+                    self._drag_bounds = self._line_bounds(x_lines, idx)
                 elif self._drag_target == DragTarget.H_LINE:
                     idx = self._drag_line_index
-                    if 0 < idx < len(self.grid_config.y_lines) - 1:
-                        self._drag_original_value = self.grid_config.y_lines[idx]
+                    self._drag_original_value = int(y_lines[idx])
+                    self._drag_bounds = self._line_bounds(y_lines, idx)
+                else:
+                    v_idx, h_idx = self._drag_line_index
+                    self._drag_original_value = (int(x_lines[v_idx]), int(y_lines[h_idx]))
+                    self._drag_bounds = (
+                        self._line_bounds(x_lines, v_idx),
+                        self._line_bounds(y_lines, h_idx),
+                    )
         
         elif self.mode == EditorMode.SELECT_CELLS:
+            self._last_drag_xy = (event.x, event.y)
             cell = self._find_cell_at(event.x, event.y)
             if cell:
+                self._hover_cell = cell  # Dragging on from here won't re-exclude it
                 self.grid_config.toggle_cell(cell[0], cell[1])
                 self._notify_change()
                 self.redraw()
@@ -1102,21 +1345,25 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             # Check if clicking near first point to close polygon
             if len(self._contour_points) >= 3 and not self._contour_closed:
                 first_x, first_y = self._contour_points[0]
-                dist = ((ix - first_x) ** 2 + (iy - first_y) ** 2) ** 0.5
+                dx, dy = ix - first_x, iy - first_y
                 close_threshold = max(10, 20 / self.zoom_level)  # Pixels in image coords
                 
-                if dist <= close_threshold:
+                if dx * dx + dy * dy <= close_threshold * close_threshold:
                     self.close_contour()
                     return
             
-            # If contour is closed, start a new one
-            if self._contour_closed:
+            # If contour is closed, start a new one (its cell tint goes away)
+            was_closed = self._contour_closed
+            if was_closed:
                 self._contour_points = []
                 self._contour_closed = False
             
-            # Add new point
+            # Add new point; an open contour is only Tk items
             self._contour_points.append((ix, iy))
-            self.redraw()
+            if was_closed:
+                self.redraw()
+            else:
+                self._request_overlay_refresh()
         
         elif self.mode == EditorMode.DEFINE_PIXEL:
             # Start pixel definition
@@ -1124,7 +1371,7 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             self._pixel_defining = True
             self._pixel_start = (ix, iy)
             self._pixel_end = (ix, iy)
-            self.redraw()
+            self._request_overlay_refresh()
     
     def _on_drag(self, event: tk.Event) -> None:
         """Handle mouse drag."""
@@ -1134,88 +1381,137 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
             self.offset_x += dx
             self.offset_y += dy
             self._pan_start = (event.x, event.y)
-            self.redraw()
+            self._request_redraw()
         
         elif self.mode == EditorMode.ADJUST_GRID and self._drag_target != DragTarget.NONE:
             self._handle_grid_drag(event)
         
         elif self.mode == EditorMode.SELECT_CELLS:
-            # Drag selection - toggle cells as we pass over them
-            cell = self._find_cell_at(event.x, event.y)
-            if cell and cell != self._hover_cell:
-                self._hover_cell = cell
-                # Only add to excluded, don't toggle during drag
-                if not self.grid_config.is_cell_excluded(cell[0], cell[1]):
-                    self.grid_config.excluded_cells.add(cell)
-                    self._notify_change()
-                    self.redraw()
+            # Drag selection - exclude every cell the pointer passed over
+            self._exclude_cells_along(self._last_drag_xy, (event.x, event.y))
+            self._last_drag_xy = (event.x, event.y)
         
         elif self.mode == EditorMode.AREA_SELECT and self._area_selecting:
             # Update area selection end point
             ix, iy = self.screen_to_image(event.x, event.y)
             self._area_end = (ix, iy)
-            self.redraw()
+            self._request_redraw()
         
         elif self.mode == EditorMode.DEFINE_PIXEL and self._pixel_defining:
             # Update pixel definition end point
             ix, iy = self.screen_to_image(event.x, event.y)
             self._pixel_end = (ix, iy)
-            self.redraw()
+            self._request_overlay_refresh()
+    
+    def _exclude_cells_along(self, start: tuple[int, int], end: tuple[int, int]) -> None:
+        """
+        Exclude the cells under a drag segment, in screen coordinates.
+        
+        Motion events skip pixels on fast sweeps, so the segment since the
+        previous event is sampled every screen pixel. The cell the drag is
+        still in (the hover cell) is left alone until the pointer leaves it.
+        """
+        n = max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1
+        sx = np.linspace(start[0], end[0], n)
+        sy = np.linspace(start[1], end[1], n)
+        
+        # Truncate toward zero like _find_cell_at
+        ix = ((sx - self.img_x) / self.zoom_level).astype(np.int64)
+        iy = ((sy - self.img_y) / self.zoom_level).astype(np.int64)
+        cols, rows, valid = self.grid_config.hit_cells(ix, iy)
+        
+        if self._hover_cell is not None:
+            left = (cols != self._hover_cell[0]) | (rows != self._hover_cell[1])
+            if not left.any():
+                return
+            first = int(np.argmax(left))
+            cols, rows, valid = cols[first:], rows[first:], valid[first:]
+        
+        cols, rows = cols[valid], rows[valid]
+        if len(cols) == 0:
+            return
+        self._hover_cell = (int(cols[-1]), int(rows[-1]))
+        
+        # Only add to excluded, don't toggle during drag
+        state = self.grid_config.state
+        if (state[rows, cols] != CELL_EXCLUDED).any():
+            state[rows, cols] = CELL_EXCLUDED
+            self._notify_change()
+            self._request_redraw()
     
     def _handle_grid_drag(self, event: tk.Event) -> None:
         """Handle dragging grid lines."""
-        if self._drag_target == DragTarget.V_LINE:
-            idx = self._drag_line_index
-            if 0 < idx < len(self.grid_config.x_lines) - 1:
-                # Calculate new X position in image coords
-                dx_screen = event.x - self._drag_start_pos[0]
-                dx_image = int(dx_screen / self.zoom_level)
-                new_x = self._drag_original_value + dx_image
-                
-                # Clamp to valid range
-                min_x = self.grid_config.x_lines[idx - 1] + GRID_EDITOR.min_cell_size
-                max_x = self.grid_config.x_lines[idx + 1] - GRID_EDITOR.min_cell_size
-                new_x = max(min_x, min(max_x, new_x))
-                
-                self.grid_config.x_lines[idx] = new_x
-                self.redraw()
+        dx_screen = event.x - self._drag_start_pos[0]
+        dy_screen = event.y - self._drag_start_pos[1]
+        x_lines, y_lines = self.grid_config.x_lines, self.grid_config.y_lines
         
+        if self._drag_target == DragTarget.V_LINE:
+            moved = self._move_line(
+                x_lines, self._drag_line_index, self._drag_original_value,
+                self._drag_bounds, dx_screen
+            )
         elif self._drag_target == DragTarget.H_LINE:
-            idx = self._drag_line_index
-            if 0 < idx < len(self.grid_config.y_lines) - 1:
-                dy_screen = event.y - self._drag_start_pos[1]
-                dy_image = int(dy_screen / self.zoom_level)
-                new_y = self._drag_original_value + dy_image
-                
-                min_y = self.grid_config.y_lines[idx - 1] + GRID_EDITOR.min_cell_size
-                max_y = self.grid_config.y_lines[idx + 1] - GRID_EDITOR.min_cell_size
-                new_y = max(min_y, min(max_y, new_y))
-                
-                self.grid_config.y_lines[idx] = new_y
-                self.redraw()
-        
+            moved = self._move_line(
+                y_lines, self._drag_line_index, self._drag_original_value,
+                self._drag_bounds, dy_screen
+            )
         elif self._drag_target == DragTarget.CORNER:
-            # Decode indices
-            v_idx = self._drag_line_index // 1000
-            h_idx = self._drag_line_index % 1000
-            
             # Move both lines
-            if 0 < v_idx < len(self.grid_config.x_lines) - 1:
-                dx_screen = event.x - self._drag_start_pos[0]
-                dx_image = int(dx_screen / self.zoom_level)
-                # This is simplified - would need to store both original values
-            
-            if 0 < h_idx < len(self.grid_config.y_lines) - 1:
-                dy_screen = event.y - self._drag_start_pos[1]
-                dy_image = int(dy_screen / self.zoom_level)
-            
-            self.redraw()
+            v_idx, h_idx = self._drag_line_index
+            orig_x, orig_y = self._drag_original_value
+            bounds_x, bounds_y = self._drag_bounds
+            moved_x = self._move_line(x_lines, v_idx, orig_x, bounds_x, dx_screen)
+            moved_y = self._move_line(y_lines, h_idx, orig_y, bounds_y, dy_screen)
+            moved = moved_x or moved_y
+        else:
+            return
+        
+        if moved:
+            self._invalidate_cache()
+            self._request_redraw()
+    
+    @staticmethod
+    def _line_bounds(lines: np.ndarray, idx: int) -> tuple[int, int] | None:
+        """
+        Get the range an inner grid line can move in.
+        
+        Returns:
+            (min_pos, max_pos) keeping min_cell_size to its neighbours,
+            or None for the outer edges, which never move.
+        """
+        if not 0 < idx < len(lines) - 1:
+            return None
+        return (
+            int(lines[idx - 1]) + GRID_EDITOR.min_cell_size,
+            int(lines[idx + 1]) - GRID_EDITOR.min_cell_size,
+        )
+    
+    def _move_line(
+        self,
+        lines: np.ndarray,
+        idx: int,
+        original: int,
+        bounds: tuple[int, int] | None,
+        delta_screen: int
+    ) -> bool:
+        """
+        Move a grid line by a drag distance in screen pixels.
+        
+        Returns:
+            True if the line is movable (bounds is not None).
+        """
+        if bounds is None:
+            return False
+        
+        min_pos, max_pos = bounds
+        lines[idx] = min(max_pos, max(min_pos, original + int(delta_screen / self.zoom_level)))
+        return True
     
     def _on_release(self, event: tk.Event) -> None:
         """Handle mouse release."""
         if self._panning:
             self._panning = False
-            self.config(cursor='')
+            self._set_cursor('')
         
         if self._drag_target != DragTarget.NONE:
             self._drag_target = DragTarget.NONE
@@ -1247,10 +1543,15 @@ class AdvancedGridEditorCanvas(BaseZoomableCanvas):
     
     def _on_leave(self, event: tk.Event) -> None:
         """Handle mouse leaving canvas."""
-        if self._hover_line or self._hover_cell:
+        self._pending_motion = None  # Don't restore the hover after leaving
+        if self._hover_line:
+            # The hovered line is the only 'grid_line' item
             self._hover_line = None
+            self.delete('grid_line')
+            self._update_cursor()
+        if self._hover_cell:
             self._hover_cell = None
-            self.redraw()
+            self.delete('cell_hover')
     
     def _on_right_click(self, event: tk.Event) -> None:
         """Handle right mouse click."""
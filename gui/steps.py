@@ -11,15 +11,12 @@ from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 from typing import Callable, TYPE_CHECKING
 
+import numpy as np
 from PIL import Image
 
 if TYPE_CHECKING:
     from PIL.Image import Image as PILImage
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from config import UI_COLORS, REGION, COLOR, FILE
 from core import draw_grid_overlay, detect_pixel_size, transform_to_real_pixels
 from core.exceptions import InvalidImageError
@@ -33,6 +30,19 @@ from gui.canvases import RegionSelectCanvas, RegionEditorCanvas
 RegionConfig = dict
 Color = tuple[int, int, int]
 
+# Resized Step 4 outputs kept for repeated save/copy (at most 256x256 RGBA each)
+_RESIZE_CACHE_SIZE = 32
+
+# Step 3 help text per editor mode value
+_MODE_HELP_TEXTS = {
+    "define_pixel": "Arrastra sobre UN píxel para definir tamaño y posición del grid",
+    "pan_zoom": "Scroll: zoom | Click derecho: pan",
+    "adjust_grid": "Arrastrar líneas del grid para ajustar",
+    "select_cells": "Click en celdas para excluir/incluir",
+    "area_select": "Dibuja un área y usa botones para incluir/excluir",
+    "contour_select": "Click para añadir puntos. Click cerca del inicio para cerrar. Click derecho: deshacer",
+}
+
 
 # =============================================================================
 # STEP 1: LOAD IMAGE
@@ -348,6 +358,13 @@ class Step3Frame(ttk.Frame):
         self.current_region_idx: int = 0
         self.current_region_image: PILImage | None = None
         self.excluded_colors: list[Color | None] = [None, None]
+        self._after_ids: dict[str, str] = {}  # Pending debounced callbacks by name
+        self._active_mode: str | None = None  # Mode value last passed to the canvas
+        self._swatch_bg = ['#333', '#333']  # Current exclude swatch backgrounds
+        self._wheel_delta = 0  # Wheel delta not yet scrolled in the left panel
+        self._wheel_pending = False
+        self._cell_info_pending = False
+        self._cell_info_key: tuple[int, int, int] | None = None  # Shown (cols, rows, excluded)
         
         # Import here to avoid circular imports
         from gui.grid_editor import AdvancedGridEditorCanvas, GridConfig, EditorMode
@@ -390,11 +407,9 @@ class Step3Frame(ttk.Frame):
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.left_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Enable mouse wheel scrolling
-        def on_mousewheel(event):
-            self.left_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        self.left_canvas.bind_all("<MouseWheel>", on_mousewheel)
+        # Enable mouse wheel scrolling (the handler ignores wheel events
+        # outside the panel, which belong to the grid editor's zoom)
+        self.left_canvas.bind_all("<MouseWheel>", self._on_panel_mousewheel)
         
         # Region navigation
         nav_region = ttk.Frame(left)
@@ -630,12 +645,18 @@ class Step3Frame(ttk.Frame):
         ttk.Label(tol_row, text="Tolerancia:").pack(side=tk.LEFT)
         
         self.tolerance = tk.IntVar(value=REGION.default_tolerance)
-        ttk.Scale(
+        tol_scale = ttk.Scale(
             tol_row, 
             from_=0, to=50, 
             variable=self.tolerance, 
-            orient=tk.HORIZONTAL
-        ).pack(side=tk.LEFT, fill=tk.X, expand=True)
+            orient=tk.HORIZONTAL,
+            command=lambda _value: self._debounce('tolerance', self._apply_tolerance)
+        )
+        tol_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tol_scale.bind(
+            '<ButtonRelease-1>',
+            lambda e: self._flush_debounced('tolerance', self._apply_tolerance)
+        )
         
         ttk.Separator(left, orient='horizontal').pack(fill=tk.X, pady=5)
         
@@ -663,22 +684,37 @@ class Step3Frame(ttk.Frame):
         )
         self.canvas.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
     
+    def _on_panel_mousewheel(self, event: tk.Event) -> None:
+        """Accumulate wheel motion over the left panel and scroll once per idle."""
+        panel = str(self.left_canvas)
+        widget = str(event.widget)
+        if widget != panel and not widget.startswith(panel + '.'):
+            return
+        
+        self._wheel_delta += event.delta
+        if not self._wheel_pending:
+            self._wheel_pending = True
+            self.after_idle(self._flush_panel_scroll)
+    
+    def _flush_panel_scroll(self) -> None:
+        """Scroll the left panel by the whole wheel notches accumulated so far."""
+        self._wheel_pending = False
+        # Keep the remainder so small trackpad deltas still add up to a notch
+        units = int(-self._wheel_delta / 120)
+        self._wheel_delta += units * 120
+        if units:
+            self.left_canvas.yview_scroll(units, "units")
+    
     def _on_mode_changed(self) -> None:
         """Handle mode selection change."""
         mode_str = self.current_mode.get()
-        mode = self.EditorMode(mode_str)
-        self.canvas.set_mode(mode)
+        if mode_str == self._active_mode:
+            return  # Radiobutton clicked again
+        self._active_mode = mode_str
+        self.canvas.set_mode(self.EditorMode(mode_str))
         
         # Update help text
-        help_texts = {
-            "define_pixel": "Arrastra sobre UN píxel para definir tamaño y posición del grid",
-            "pan_zoom": "Scroll: zoom | Click derecho: pan",
-            "adjust_grid": "Arrastrar líneas del grid para ajustar",
-            "select_cells": "Click en celdas para excluir/incluir",
-            "area_select": "Dibuja un área y usa botones para incluir/excluir",
-            "contour_select": "Click para añadir puntos. Click cerca del inicio para cerrar. Click derecho: deshacer",
-        }
-        self.mode_help.config(text=help_texts.get(mode_str, ""))
+        self.mode_help.config(text=_MODE_HELP_TEXTS.get(mode_str, ""))
     
     def _apply_pixel_definition(self) -> None:
         """Apply the pixel definition to set up the grid."""
@@ -703,7 +739,6 @@ class Step3Frame(ttk.Frame):
         
         # Apply the grid
         self.canvas.reset_to_uniform(cell_size, offset_x % cell_size, offset_y % cell_size)
-        self._update_cell_info()
         
         # Clear the pixel definition visualization
         self.canvas.clear_pixel_definition()
@@ -736,38 +771,32 @@ class Step3Frame(ttk.Frame):
         off_y = self.offset_y.get()
         
         self.canvas.reset_to_uniform(cell_size, off_x, off_y)
-        self._update_cell_info()
     
     def _select_all_cells(self) -> None:
         """Mark all cells as included."""
         self.canvas.select_all_cells()
-        self._update_cell_info()
     
     def _deselect_all_cells(self) -> None:
         """Mark all cells as excluded."""
         self.canvas.deselect_all_cells()
-        self._update_cell_info()
     
     def _invert_selection(self) -> None:
         """Invert cell selection."""
         self.canvas.invert_selection()
-        self._update_cell_info()
     
     def _include_area_selection(self) -> None:
         """Include all cells in the area selection."""
         if not self.canvas.has_area_selection():
             messagebox.showinfo("Info", "Dibuja primero un área en modo '🔲 Área'")
             return
-        changed = self.canvas.include_cells_in_selection()
-        self._update_cell_info()
+        self.canvas.include_cells_in_selection()
     
     def _exclude_area_selection(self) -> None:
         """Exclude all cells in the area selection."""
         if not self.canvas.has_area_selection():
             messagebox.showinfo("Info", "Dibuja primero un área en modo '🔲 Área'")
             return
-        changed = self.canvas.exclude_cells_in_selection()
-        self._update_cell_info()
+        self.canvas.exclude_cells_in_selection()
     
     def _clear_area_selection(self) -> None:
         """Clear the area selection."""
@@ -778,16 +807,14 @@ class Step3Frame(ttk.Frame):
         if not self.canvas.is_contour_closed():
             messagebox.showinfo("Info", "Dibuja y cierra primero un contorno en modo '✏️ Contorno'")
             return
-        changed = self.canvas.include_cells_in_contour()
-        self._update_cell_info()
+        self.canvas.include_cells_in_contour()
     
     def _exclude_outside_contour(self) -> None:
         """Exclude all cells outside the contour."""
         if not self.canvas.is_contour_closed():
             messagebox.showinfo("Info", "Dibuja y cierra primero un contorno en modo '✏️ Contorno'")
             return
-        changed = self.canvas.exclude_cells_outside_contour()
-        self._update_cell_info()
+        self.canvas.exclude_cells_outside_contour()
     
     def _clear_contour(self) -> None:
         """Clear the contour."""
@@ -795,14 +822,25 @@ class Step3Frame(ttk.Frame):
     
     def _on_grid_changed(self, config) -> None:
         """Handle grid configuration change from canvas."""
+        # Every canvas edit lands here, drag-excluding once per motion; count once per idle
+        if not self._cell_info_pending:
+            self._cell_info_pending = True
+            self.after_idle(self._do_pending_cell_info)
+    
+    def _do_pending_cell_info(self) -> None:
+        """Run the cell info update queued by _on_grid_changed."""
+        self._cell_info_pending = False
         self._update_cell_info()
     
     def _update_cell_info(self) -> None:
         """Update cell info label."""
         config = self.canvas.grid_config
-        cols = config.num_cols
-        rows = config.num_rows
-        excluded = len(config.excluded_cells)
+        key = (config.num_cols, config.num_rows, int(config.excluded_mask().sum()))
+        if key == self._cell_info_key:
+            return
+        
+        self._cell_info_key = key
+        cols, rows, excluded = key
         self.cell_info.config(text=f"Celdas: {cols}×{rows} | Excluidas: {excluded}")
     
     def _validate_int(self, value: str) -> bool:
@@ -847,11 +885,7 @@ class Step3Frame(ttk.Frame):
         
         # Update color frames
         for i, color in enumerate(self.excluded_colors):
-            frame = self.exc_color1 if i == 0 else self.exc_color2
-            if color:
-                frame.config(bg='#{:02x}{:02x}{:02x}'.format(*color))
-            else:
-                frame.config(bg='#333')
+            self._set_swatch(i, color)
         
         # Load or create grid config
         if 'grid_config' in region:
@@ -934,22 +968,70 @@ class Step3Frame(ttk.Frame):
             lambda c: self._set_exclude_color(idx, c)
         )
     
+    def _set_swatch(self, idx: int, color: Color | None) -> None:
+        """Show `color` in the exclude swatch `idx`, or the empty look for None."""
+        bg = '#%02x%02x%02x' % color if color else '#333'
+        if bg != self._swatch_bg[idx]:
+            self._swatch_bg[idx] = bg
+            (self.exc_color1 if idx == 0 else self.exc_color2).config(bg=bg)
+    
     def _set_exclude_color(self, idx: int, color: Color) -> None:
         """Set an excluded color."""
         self.excluded_colors[idx] = color
-        frame = self.exc_color1 if idx == 0 else self.exc_color2
-        frame.config(bg='#{:02x}{:02x}{:02x}'.format(*color))
+        self._set_swatch(idx, color)
         
-        # Sync with canvas and redraw
+        # Sync with canvas and redraw, unless the same color was picked again
+        tolerance = self.tolerance.get()
+        if (self.excluded_colors == self.canvas.excluded_colors
+                and tolerance == self.canvas.color_tolerance):
+            return
         self.canvas.excluded_colors = self.excluded_colors.copy()
-        self.canvas.color_tolerance = self.tolerance.get()
+        self.canvas.color_tolerance = tolerance
         self.canvas.redraw()
     
+    def _apply_tolerance(self) -> None:
+        """Sync the tolerance slider with the canvas color exclusion preview."""
+        tolerance = self.tolerance.get()
+        if tolerance == self.canvas.color_tolerance:
+            return
+        
+        self.canvas.color_tolerance = tolerance
+        if any(self.canvas.excluded_colors):
+            self.canvas.redraw()
+    
+    def _debounce(self, name: str, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once input named `name` has been idle for a moment.
+        
+        Each call cancels the callback still pending under the same name, so
+        a slider drag only reaches the canvas after it pauses.
+        
+        Args:
+            name: Key identifying the input being debounced.
+            callback: Function to run after REGION.input_debounce_ms.
+        """
+        pending = self._after_ids.pop(name, None)
+        if pending is not None:
+            self.after_cancel(pending)
+        
+        def run() -> None:
+            del self._after_ids[name]
+            callback()
+        
+        self._after_ids[name] = self.after(REGION.input_debounce_ms, run)
+    
+    def _flush_debounced(self, name: str, callback: Callable[[], None]) -> None:
+        """Cancel the pending callback for `name` and run `callback` now."""
+        pending = self._after_ids.pop(name, None)
+        if pending is not None:
+            self.after_cancel(pending)
+        callback()
+    
     def _clear_exclude_colors(self) -> None:
         """Clear all excluded colors."""
         self.excluded_colors = [None, None]
-        self.exc_color1.config(bg='#333')
-        self.exc_color2.config(bg='#333')
+        self._set_swatch(0, None)
+        self._set_swatch(1, None)
         
         # Sync with canvas and redraw
         self.canvas.excluded_colors = [None, None]
@@ -993,6 +1075,8 @@ class Step4Frame(ttk.Frame):
         
         self.results: dict[int, PILImage] = {}
         self.original_path: Path | None = None
+        # Resized outputs by (region idx, target size), cleared with new results
+        self._resize_cache: dict[tuple[int, int], PILImage] = {}
         
         self._create_widgets()
     
@@ -1147,6 +1231,20 @@ class Step4Frame(ttk.Frame):
         
         return canvas
     
+    def _get_resized(self, idx: int, target_size: int) -> PILImage:
+        """Get result `idx` resized to `target_size`, reusing earlier resizes."""
+        if target_size == 0:
+            return self.results[idx]
+        
+        key = (idx, target_size)
+        resized = self._resize_cache.get(key)
+        if resized is None:
+            resized = self._resize_image(self.results[idx], target_size)
+            if len(self._resize_cache) >= _RESIZE_CACHE_SIZE:
+                self._resize_cache.pop(next(iter(self._resize_cache)))
+            self._resize_cache[key] = resized
+        return resized
+    
     def _on_size_changed(self, event: tk.Event = None) -> None:
         """Handle output size preset change."""
         target = self._get_target_size()
@@ -1155,13 +1253,13 @@ class Step4Frame(ttk.Frame):
         else:
             self.size_info.config(text=f"→ {target}×{target}px")
     
-    def _get_selected_image(self) -> PILImage | None:
-        """Get the currently selected result image."""
+    def _get_selected_index(self) -> int | None:
+        """Get the region index of the currently selected result."""
         sel = self.result_list.curselection()
         if not sel:
             return None
         idx = list(self.results.keys())[sel[0]]
-        return self.results.get(idx)
+        return idx if idx in self.results else None
     
     def _copy_to_clipboard(self, format_type: str) -> None:
         """
@@ -1173,14 +1271,13 @@ class Step4Frame(ttk.Frame):
         import io
         import base64
         
-        img = self._get_selected_image()
-        if img is None:
+        idx = self._get_selected_index()
+        if idx is None:
             messagebox.showinfo("Info", "Selecciona primero una región de la lista")
             return
         
         # Resize if needed
-        target_size = self._get_target_size()
-        img = self._resize_image(img, target_size)
+        img = self._get_resized(idx, self._get_target_size())
         
         try:
             if format_type == "bytes":
@@ -1199,28 +1296,16 @@ class Step4Frame(ttk.Frame):
                 
             elif format_type == "numpy":
                 # NumPy array representation
-                try:
-                    import numpy as np
-                    arr = np.array(img)
-                    text = f"np.array({arr.tolist()}, dtype=np.uint8)  # shape: {arr.shape}"
-                except ImportError:
-                    # If numpy not available, use list format
-                    pixels = list(img.getdata())
-                    w, h = img.size
-                    text = f"# Image {w}x{h}, RGBA\n{pixels}"
-                    
+                arr = np.array(img)
+                text = f"np.array({arr.tolist()}, dtype=np.uint8)  # shape: {arr.shape}"
+                
             elif format_type == "bitmap":
                 # Bitmap as binary string (1-bit representation)
                 gray = img.convert('L')
                 w, h = gray.size
-                lines = []
-                lines.append(f"# Bitmap {w}x{h}")
-                for y in range(h):
-                    row = ""
-                    for x in range(w):
-                        pixel = gray.getpixel((x, y))
-                        row += "█" if pixel > 127 else " "
-                    lines.append(f'"{row}"')
+                chars = np.where(np.asarray(gray) > 127, "█", " ")
+                lines = [f"# Bitmap {w}x{h}"]
+                lines.extend(f'"{"".join(row)}"' for row in chars.tolist())
                 text = "\n".join(lines)
             else:
                 text = ""
@@ -1248,6 +1333,7 @@ class Step4Frame(ttk.Frame):
         """Set the results to display."""
         self.results = results
         self.original_path = original_path
+        self._resize_cache.clear()
         
         self.result_list.delete(0, tk.END)
         for idx, img in results.items():
@@ -1282,9 +1368,9 @@ class Step4Frame(ttk.Frame):
         folder = filedialog.askdirectory(title="Seleccionar carpeta")
         if folder:
             try:
-                for idx, img in self.results.items():
+                for idx in self.results:
                     # Resize if needed
-                    output_img = self._resize_image(img, target_size)
+                    output_img = self._get_resized(idx, target_size)
                     name = f"{self.original_path.stem}{FILE.region_suffix}{idx+1}{size_suffix}.png"
                     output_img.save(Path(folder) / name, FILE.output_format)
                 
@@ -1320,7 +1406,7 @@ class Step4Frame(ttk.Frame):
         if filepath:
             try:
                 # Resize if needed
-                output_img = self._resize_image(self.results[idx], target_size)
+                output_img = self._get_resized(idx, target_size)
                 output_img.save(filepath, FILE.output_format)
                 
                 size_text = f" ({target_size}×{target_size}px)" if target_size > 0 else ""
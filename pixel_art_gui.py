@@ -29,8 +29,8 @@ from core.exceptions import PixelArtError, ProcessingError
 from gui import Step1Frame, Step2Frame, Step3Frame, Step4Frame
 
 
-# Module logger
-logger = setup_logging()
+# Module logger (configured in main)
+logger = logging.getLogger("PixelArtTransformer")
 
 
 class PixelArtTransformerGUI:
@@ -320,7 +320,7 @@ class PixelArtTransformerGUI:
                     image=region_image,
                     x_lines=grid_config.x_lines,
                     y_lines=grid_config.y_lines,
-                    excluded_cells=grid_config.excluded_cells,
+                    excluded_mask=grid_config.excluded_mask(),
                     bit_depth=region.get('bits', 8),
                     excluded_colors=region.get('excluded_colors'),
                     tolerance=region.get('tolerance', 10)
@@ -346,6 +346,8 @@ def main() -> None:
     from PIL import Image, ImageTk
     import os
     
+    setup_logging()
+    
     # Get the directory where the script is located
     script_dir = Path(__file__).parent
     icon_path = script_dir / "assets" / "icon.png"
@@ -30,8 +30,8 @@ from core import (
 from core.exceptions import InvalidImageError, GridDetectionError
 
 
-# Module logger
-logger = setup_logging(logging.INFO)
+# Module logger (configured in main)
+logger = logging.getLogger("PixelArtTransformer")
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -96,8 +96,7 @@ def main() -> int:
     """
     args = parse_arguments()
     
-    if args.verbose:
-        setup_logging(logging.DEBUG)
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO)
     
     # Validate input file
     input_path = Path(args.input)
@@ -0,0 +1,260 @@
+"""
+Tests for the grid editor's GridConfig.
+"""
+
+import pytest
+import numpy as np
+from PIL import Image
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.grid_editor import (
+    AdvancedGridEditorCanvas,
+    EditorMode,
+    GridConfig,
+    CELL_NEUTRAL,
+    CELL_EXCLUDED,
+    CELL_INCLUDED,
+)
+
+
+# =============================================================================
+# TEST FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def grid_4x3():
+    """Create a non-uniform grid with 4 columns and 3 rows."""
+    return GridConfig(x_lines=[0, 10, 25, 30, 40], y_lines=[0, 8, 20, 32])
+
+
+# =============================================================================
+# TEST cell state
+# =============================================================================
+
+class TestCellState:
+    """Tests for the per-cell selection state."""
+    
+    def test_state_matches_grid(self, grid_4x3):
+        """A new grid should have an all-neutral (rows, cols) state."""
+        state = grid_4x3.state
+        assert state.shape == (3, 4)
+        assert state.dtype == np.uint8
+        assert (state == CELL_NEUTRAL).all()
+    
+    def test_state_resized_on_read(self, grid_4x3):
+        """Changing the lines should resize the state, keeping overlapping cells."""
+        grid_4x3.state[1, 2] = CELL_EXCLUDED
+        grid_4x3.state[2, 3] = CELL_INCLUDED
+        
+        # Drop the last column, add a row
+        grid_4x3.x_lines = np.array([0, 10, 25, 30], dtype=np.int32)
+        grid_4x3.y_lines = np.array([0, 8, 20, 32, 40], dtype=np.int32)
+        
+        state = grid_4x3.state
+        assert state.shape == (4, 3)
+        assert state[1, 2] == CELL_EXCLUDED
+        assert state.sum() == CELL_EXCLUDED  # The included cell was cut off
+    
+    def test_toggle_cycle(self, grid_4x3):
+        """Toggling should cycle neutral -> excluded -> included -> neutral."""
+        seen = []
+        for _ in range(4):
+            seen.append((grid_4x3.is_cell_excluded(1, 2), grid_4x3.is_cell_included(1, 2)))
+            grid_4x3.toggle_cell(1, 2)
+        
+        assert seen == [(False, False), (True, False), (False, True), (False, False)]
+    
+    def test_toggle_outside_grid(self, grid_4x3):
+        """Toggling a cell outside the grid should do nothing."""
+        grid_4x3.toggle_cell(4, 0)
+        grid_4x3.toggle_cell(-1, 0)
+        grid_4x3.toggle_cell(0, 3)
+        assert grid_4x3.state.sum() == 0
+        assert not grid_4x3.is_cell_excluded(4, 0)
+    
+    def test_masks(self, grid_4x3):
+        """excluded_mask and included_mask should mark matching cells."""
+        grid_4x3.toggle_cell(0, 0)
+        grid_4x3.toggle_cell(3, 2)
+        grid_4x3.toggle_cell(3, 2)
+        
+        excluded = grid_4x3.excluded_mask()
+        included = grid_4x3.included_mask()
+        assert excluded.dtype == bool and excluded.shape == (3, 4)
+        assert np.argwhere(excluded).tolist() == [[0, 0]]
+        assert np.argwhere(included).tolist() == [[2, 3]]
+    
+    def test_cell_sets(self, grid_4x3):
+        """excluded_cells and included_cells should list (col, row) pairs."""
+        grid_4x3.toggle_cell(2, 1)
+        grid_4x3.toggle_cell(0, 2)
+        grid_4x3.toggle_cell(0, 2)
+        
+        assert grid_4x3.excluded_cells == {(2, 1)}
+        assert grid_4x3.included_cells == {(0, 2)}
+    
+    def test_cell_sets_are_read_only(self, grid_4x3):
+        """Adding to the derived cell sets should raise instead of being lost."""
+        with pytest.raises(AttributeError):
+            grid_4x3.excluded_cells.add((0, 0))
+        with pytest.raises(AttributeError):
+            grid_4x3.included_cells.add((0, 0))
+    
+    def test_copy_is_independent(self, grid_4x3):
+        """Changes to a copy should not affect the original."""
+        grid_4x3.toggle_cell(1, 1)
+        clone = grid_4x3.copy()
+        
+        clone.toggle_cell(1, 1)
+        clone.toggle_cell(2, 2)
+        clone.x_lines[1] = 12
+        
+        assert grid_4x3.is_cell_excluded(1, 1)
+        assert not grid_4x3.is_cell_excluded(2, 2)
+        assert grid_4x3.x_lines[1] == 10
+        assert clone.is_cell_included(1, 1)
+
+
+# =============================================================================
+# TEST hit testing
+# =============================================================================
+
+class TestHitCell:
+    """Tests for hit_cell and hit_cells."""
+    
+    @pytest.mark.parametrize("point, cell", [
+        ((0, 0), (0, 0)),
+        ((9, 7), (0, 0)),
+        ((10, 8), (1, 1)),     # Points on a line belong to the cell after it
+        ((29, 31), (2, 2)),
+        ((39, 31), (3, 2)),    # Last pixel inside the grid
+    ])
+    def test_inside(self, grid_4x3, point, cell):
+        """Points inside the grid should map to their cell."""
+        assert grid_4x3.hit_cell(*point) == cell
+    
+    @pytest.mark.parametrize("point", [
+        (40, 5),     # On the right edge line
+        (5, 32),     # On the bottom edge line
+        (40, 32),    # Bottom-right corner
+        (100, 5),
+        (-1, 5),
+        (5, -1),
+        (-20, -20),
+    ])
+    def test_outside(self, grid_4x3, point):
+        """The right and bottom edges and negative points should give None."""
+        assert grid_4x3.hit_cell(*point) is None
+    
+    def test_vectorized_matches_scalar(self, grid_4x3):
+        """hit_cells should agree with hit_cell point by point."""
+        xs, ys = np.meshgrid(np.arange(-3, 44), np.arange(-3, 36))
+        xs, ys = xs.ravel(), ys.ravel()
+        cols, rows, valid = grid_4x3.hit_cells(xs, ys)
+        
+        for x, y, col, row, ok in zip(xs, ys, cols, rows, valid):
+            expected = grid_4x3.hit_cell(int(x), int(y))
+            assert (expected is not None) == ok
+            if ok:
+                assert expected == (col, row)
+    
+    def test_empty_grid(self):
+        """A grid without cells should never hit."""
+        assert GridConfig().hit_cell(0, 0) is None
+        _, _, valid = GridConfig().hit_cells(np.array([0, 5]), np.array([0, 5]))
+        assert not valid.any()
+
+
+# =============================================================================
+# TEST from_uniform
+# =============================================================================
+
+def _baseline_uniform_lines(offset: int, size: int, cell_size: int) -> list[int]:
+    """Line positions as the original list-based from_uniform built them."""
+    start = offset if offset >= 0 else offset % cell_size
+    lines = list(range(start, size + 1, cell_size))
+    if lines and lines[-1] < size:
+        lines.append(size)
+    if not lines or lines[0] > 0:
+        lines.insert(0, 0)
+    return lines
+
+
+class TestFromUniform:
+    """Tests for GridConfig.from_uniform."""
+    
+    @pytest.mark.parametrize("offset, size, cell_size", [
+        (0, 64, 16),     # Exact fit
+        (0, 70, 16),     # Remainder column at the end
+        (5, 64, 16),     # Remainder column at the start
+        (-3, 64, 16),    # Negative offset wraps to 13
+        (-16, 64, 16),   # Negative offset of a whole cell
+        (-40, 64, 16),   # Negative offset beyond one cell
+        (64, 64, 16),    # Offset at the image size
+        (80, 64, 16),    # Offset beyond the image size
+        (0, 10, 16),     # Cell larger than the image
+        (3, 10, 16),
+        (-5, 10, 16),
+        (0, 1, 1),
+    ])
+    def test_matches_baseline(self, offset, size, cell_size):
+        """Lines should match the original list-based construction."""
+        expected = _baseline_uniform_lines(offset, size, cell_size)
+        config = GridConfig.from_uniform(size, size, cell_size, offset, offset)
+        
+        assert config.x_lines.dtype == np.int32
+        assert config.x_lines.tolist() == expected
+        assert config.y_lines.tolist() == expected
+    
+    def test_independent_axes(self):
+        """Width, height and offsets should apply per axis."""
+        config = GridConfig.from_uniform(50, 30, 10, offset_x=-2, offset_y=4)
+        assert config.x_lines.tolist() == _baseline_uniform_lines(-2, 50, 10)
+        assert config.y_lines.tolist() == _baseline_uniform_lines(4, 30, 10)
+        assert config.state.shape == (config.num_rows, config.num_cols)
+
+
+# =============================================================================
+# TEST grid overlay
+# =============================================================================
+
+def _overlay_editor(width: int, height: int, cell_size: int, zoom: float):
+    """Build a grid editor without a Tk window, enough to render its overlay."""
+    editor = AdvancedGridEditorCanvas.__new__(AdvancedGridEditorCanvas)
+    editor.image = Image.new('RGB', (width, height))
+    editor.grid_config = GridConfig.from_uniform(width, height, cell_size)
+    editor.zoom_level = zoom
+    editor.mode = EditorMode.PAN_ZOOM
+    editor.excluded_colors = [None, None]
+    editor.color_tolerance = 10
+    editor._centers = None
+    editor._color_mask_cache = None
+    return editor
+
+
+class TestGridOverlay:
+    """Tests for the grid lines baked into the editor overlay."""
+    
+    @pytest.mark.parametrize("zoom", [1.0, 2.0, 2.5])
+    def test_border_lines_drawn(self, zoom):
+        """All four image borders should carry a grid line."""
+        editor = _overlay_editor(40, 24, 8, zoom)
+        new_w, new_h = int(40 * zoom), int(24 * zoom)
+        overlay = editor._grid_overlay((0, 0, new_w, new_h))
+        
+        line = overlay[..., 3] > 0
+        assert line[:, 0].all() and line[0, :].all()
+        assert line[:, new_w - 1].all()
+        assert line[new_h - 1, :].all()
+    
+    def test_edge_outside_box_not_drawn(self):
+        """The right border should not be pulled into a box that ends before it."""
+        editor = _overlay_editor(40, 24, 8, 2.0)
+        overlay = editor._grid_overlay((0, 0, 70, 48))
+        
+        line = overlay[..., 3] > 0
+        assert line[:, 64].all()       # Inner line at x = 32
+        assert not line[5, 69]         # Border at x = 80 lies outside the box
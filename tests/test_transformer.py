@@ -6,18 +6,26 @@ import pytest
 from PIL import Image
 import numpy as np
 
+import gc
 import sys
 import os
+import weakref
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core import (
     reduce_color,
+    reduce_color_array,
     colors_similar,
+    colors_similar_mask,
     get_center_color,
     detect_pixel_size,
     transform_to_real_pixels,
+    transform_with_custom_grid,
     create_grid_visualization,
+    draw_grid_overlay,
+    invalidate_image_cache,
 )
+from core.transformer import _rgb_array
 
 
 # =============================================================================
@@ -116,6 +124,35 @@ class TestReduceColor:
         # Factor = 256 // 2 = 128
         assert reduce_color((0, 0, 0), 1) == (64, 64, 64)
         assert reduce_color((200, 200, 200), 1) == (192, 192, 192)
+    
+    @pytest.mark.parametrize("bits", [0, -1])
+    def test_invalid_bits_raise(self, bits):
+        """Bit depths below 1 should raise ValueError."""
+        with pytest.raises(ValueError):
+            reduce_color((100, 150, 200), bits)
+
+
+class TestReduceColorArray:
+    """Tests for reduce_color_array function."""
+    
+    def test_8bit_unchanged(self):
+        """8-bit should return the array unchanged."""
+        arr = np.arange(256, dtype=np.uint8)
+        assert np.array_equal(reduce_color_array(arr, 8), arr)
+    
+    @pytest.mark.parametrize("bits", [1, 2, 3, 4, 5, 6, 7])
+    def test_matches_scalar(self, bits):
+        """Every channel value should quantize like reduce_color."""
+        arr = np.arange(256, dtype=np.uint8)
+        result = reduce_color_array(arr, bits)
+        expected = [reduce_color((c, c, c), bits)[0] for c in range(256)]
+        assert result.dtype == np.uint8
+        assert result.tolist() == expected
+    
+    def test_preserves_shape(self):
+        """Output should have the same shape as the input."""
+        arr = np.zeros((4, 5, 3), dtype=np.uint8)
+        assert reduce_color_array(arr, 4).shape == (4, 5, 3)
 
 
 # =============================================================================
@@ -156,6 +193,42 @@ class TestColorsSimilar:
         assert colors_similar(c1, c2, 10) is False
 
 
+class TestColorsSimilarMask:
+    """Tests for colors_similar_mask function."""
+    
+    def test_matches_scalar(self):
+        """Mask should agree with colors_similar for every pixel."""
+        rng = np.random.default_rng(0)
+        pixels = rng.integers(0, 256, (6, 7, 3), dtype=np.uint8)
+        colors = [tuple(int(c) for c in pixels[0, 0]), (100, 100, 100)]
+        mask = colors_similar_mask(pixels, colors, 40)
+        
+        for y in range(6):
+            for x in range(7):
+                rgb = tuple(int(c) for c in pixels[y, x])
+                expected = any(colors_similar(rgb, c, 40) for c in colors)
+                assert mask[y, x] == expected
+    
+    def test_exact_match(self):
+        """Zero tolerance should only match identical colors."""
+        pixels = np.array([[[10, 20, 30], [10, 20, 31], [30, 20, 10]]], dtype=np.uint8)
+        mask = colors_similar_mask(pixels, [(10, 20, 30)], 0)
+        assert mask.tolist() == [[True, False, False]]
+    
+    def test_ignores_alpha_and_none(self):
+        """Alpha channel and None colors should be ignored."""
+        pixels = np.array([[[10, 20, 30, 0], [200, 200, 200, 255]]], dtype=np.uint8)
+        mask = colors_similar_mask(pixels, [None, (10, 20, 30)], 0)
+        assert mask.tolist() == [[True, False]]
+    
+    def test_no_colors(self):
+        """No colors should give an all-False mask."""
+        pixels = np.zeros((2, 3, 4), dtype=np.uint8)
+        mask = colors_similar_mask(pixels, [None, None], 10)
+        assert mask.shape == (2, 3)
+        assert not mask.any()
+
+
 # =============================================================================
 # TEST get_center_color
 # =============================================================================
@@ -177,6 +250,14 @@ class TestGetCenterColor:
         color = get_center_color(img, 0, 0, 16)
         assert color[:3] == (255, 255, 255)
     
+    def test_array_input(self, pixel_art_8x8_scaled):
+        """Array input should give the same color as the image."""
+        arr = np.asarray(pixel_art_8x8_scaled)
+        for x, y in [(0, 0), (16, 0), (48, 32), (112, 112)]:
+            expected = get_center_color(pixel_art_8x8_scaled, x, y, 16)
+            assert get_center_color(arr, x, y, 16) == expected
+        assert get_center_color(arr, 0, 0, 16) == (255, 0, 0, 255)
+    
     def test_bounds_clamping(self):
         """Should clamp to image bounds."""
         img = Image.new('RGB', (10, 10), (100, 100, 100))
@@ -209,6 +290,35 @@ class TestDetectPixelSize:
         size = detect_pixel_size(pixel_art_8x8_scaled)
         assert size == 16
     
+    def test_uncommon_size(self):
+        """Should detect a scale factor outside the common sizes."""
+        rng = np.random.default_rng(0)
+        art = rng.integers(0, 4, (5, 6, 3), dtype=np.uint8) * 60
+        img = Image.fromarray(np.repeat(np.repeat(art, 7, axis=0), 7, axis=1))
+        assert detect_pixel_size(img) == 7
+    
+    def test_common_size_beats_run_length_gcd(self):
+        """A split block on the middle row should not override a common size."""
+        colors = np.array([(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)], dtype=np.uint8)
+        idx = (np.arange(10)[:, None] + np.arange(10)[None, :]) % 4
+        arr = np.repeat(np.repeat(colors[idx], 16, axis=0), 16, axis=1)
+        arr[80:96, 88:96] = (255, 255, 255)  # Middle row runs now have GCD 8
+        
+        # 99 of 100 16px blocks are uniform, above the 0.95 threshold
+        assert detect_pixel_size(Image.fromarray(arr)) == 16
+    
+    def test_image_edited_in_place(self, pixel_art_8x8_scaled):
+        """Cached arrays should not outlive in-place edits of the image."""
+        assert detect_pixel_size(pixel_art_8x8_scaled) == 16
+        
+        # Same 4-color diagonal pattern, now 16x16 pixels scaled 8x
+        art = np.array([(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)], dtype=np.uint8)
+        idx = (np.arange(16)[:, None] + np.arange(16)[None, :]) % 4
+        scaled = np.repeat(np.repeat(art[idx], 8, axis=0), 8, axis=1)
+        pixel_art_8x8_scaled.paste(Image.fromarray(scaled), (0, 0))
+        
+        assert detect_pixel_size(pixel_art_8x8_scaled) == 8
+    
     def test_tiny_image(self):
         """Tiny images should return 1."""
         img = Image.new('RGB', (1, 1), (255, 0, 0))
@@ -276,6 +386,81 @@ class TestTransformToRealPixels:
         """Output should always be RGBA."""
         result = transform_to_real_pixels(solid_color_image, 10)
         assert result.mode == 'RGBA'
+    
+    @pytest.mark.parametrize("mode", ['RGB', 'P', 'L'])
+    def test_input_modes(self, pixel_art_8x8_scaled, mode):
+        """Other input modes should match converting to RGBA first."""
+        image = pixel_art_8x8_scaled.convert(mode)
+        result = transform_to_real_pixels(image, 16)
+        expected = transform_to_real_pixels(image.convert('RGBA'), 16)
+        assert result.mode == 'RGBA'
+        assert np.array_equal(np.asarray(result), np.asarray(expected))
+
+
+# =============================================================================
+# TEST transform_with_custom_grid
+# =============================================================================
+
+class TestTransformWithCustomGrid:
+    """Tests for transform_with_custom_grid function."""
+    
+    def test_uniform_lines_match_uniform_transform(self, pixel_art_8x8_scaled):
+        """Uniform line positions should match transform_to_real_pixels."""
+        lines = list(range(0, 129, 16))
+        result = transform_with_custom_grid(pixel_art_8x8_scaled, lines, lines)
+        expected = transform_to_real_pixels(pixel_art_8x8_scaled, 16)
+        assert np.array_equal(np.asarray(result), np.asarray(expected))
+    
+    def test_non_uniform_cells(self, checkerboard_image):
+        """Each cell should sample its own center."""
+        result = transform_with_custom_grid(checkerboard_image, [0, 4, 32], [0, 16])
+        assert result.size == (2, 1)
+        assert result.getpixel((0, 0))[:3] == (255, 255, 255)
+        assert result.getpixel((1, 0))[:3] == (0, 0, 0)
+    
+    def test_excluded_cells(self, pixel_art_8x8_scaled):
+        """Manually excluded cells should become transparent."""
+        lines = list(range(0, 129, 16))
+        result = transform_with_custom_grid(
+            pixel_art_8x8_scaled, lines, lines,
+            excluded_cells={(1, 0), (7, 7), (99, 99)}
+        )
+        assert result.getpixel((1, 0)) == (0, 0, 0, 0)
+        assert result.getpixel((7, 7)) == (0, 0, 0, 0)
+        assert result.getpixel((0, 0)) == (255, 0, 0, 255)
+    
+    def test_excluded_mask(self, pixel_art_8x8_scaled):
+        """A boolean (rows, cols) mask should exclude cells like the set form."""
+        lines = list(range(0, 129, 16))
+        mask = np.zeros((8, 8), dtype=bool)
+        mask[0, 1] = mask[7, 7] = True
+        result = transform_with_custom_grid(
+            pixel_art_8x8_scaled, lines, lines, excluded_mask=mask
+        )
+        expected = transform_with_custom_grid(
+            pixel_art_8x8_scaled, lines, lines, excluded_cells={(1, 0), (7, 7)}
+        )
+        assert np.array_equal(np.asarray(result), np.asarray(expected))
+        
+        with pytest.raises(ValueError):
+            transform_with_custom_grid(
+                pixel_art_8x8_scaled, lines, lines, excluded_mask=mask[:, :4]
+            )
+    
+    def test_color_exclusion(self, solid_color_image):
+        """Excluded colors should become transparent."""
+        result = transform_with_custom_grid(
+            solid_color_image, [0, 50, 100], [0, 100],
+            excluded_colors=[None, (250, 5, 0)],
+            tolerance=5
+        )
+        assert result.getpixel((0, 0)) == (0, 0, 0, 0)
+        assert result.getpixel((1, 0)) == (0, 0, 0, 0)
+    
+    def test_too_few_lines_raises(self, solid_color_image):
+        """A grid needs at least one cell in each direction."""
+        with pytest.raises(ValueError):
+            transform_with_custom_grid(solid_color_image, [0], [0, 100])
 
 
 # =============================================================================
@@ -312,6 +497,98 @@ class TestCreateGridVisualization:
         assert result is not None
 
 
+# =============================================================================
+# TEST draw_grid_overlay
+# =============================================================================
+
+class TestDrawGridOverlay:
+    """Tests for draw_grid_overlay function."""
+    
+    def test_returns_rgba_same_size(self, solid_color_image):
+        """Should return an RGBA image of the same size."""
+        result = draw_grid_overlay(solid_color_image, 10)
+        assert result.mode == 'RGBA'
+        assert result.size == solid_color_image.size
+    
+    def test_grid_lines(self, solid_color_image):
+        """Grid lines should be drawn at every cell boundary."""
+        color = (0, 0, 255, 255)
+        result = draw_grid_overlay(
+            solid_color_image, 10, offset_x=3,
+            show_centers=False, grid_color=color
+        )
+        assert result.getpixel((3, 50)) == color
+        assert result.getpixel((13, 50)) == color
+        assert result.getpixel((50, 0)) == color
+        assert result.getpixel((5, 5)) == (255, 0, 0, 255)
+    
+    def test_excluded_markers(self, solid_color_image):
+        """Centers matching an excluded color should use the excluded marker."""
+        center = (0, 255, 0, 255)
+        excluded = (0, 0, 255, 255)
+        result = draw_grid_overlay(
+            solid_color_image, 16, show_grid=False,
+            center_color=center, excluded_color=excluded
+        )
+        assert result.getpixel((8, 8)) == center
+        
+        result = draw_grid_overlay(
+            solid_color_image, 16, show_grid=False,
+            excluded_colors=[(255, 0, 0)],
+            center_color=center, excluded_color=excluded
+        )
+        assert result.getpixel((8, 8)) == excluded
+    
+    def test_excluded_markers_after_edit(self, solid_color_image):
+        """Exclusion markers should follow in-place edits of the image."""
+        center = (0, 255, 0, 255)
+        excluded = (0, 0, 255, 255)
+        kwargs = dict(
+            show_grid=False, bit_depth=4, excluded_colors=[(248, 8, 8)],
+            center_color=center, excluded_color=excluded
+        )
+        assert draw_grid_overlay(solid_color_image, 16, **kwargs).getpixel((8, 8)) == excluded
+        
+        solid_color_image.paste((0, 0, 255), (0, 0, 16, 16))
+        result = draw_grid_overlay(solid_color_image, 16, **kwargs)
+        assert result.getpixel((8, 8)) == center
+        assert result.getpixel((24, 8)) == excluded
+
+
+# =============================================================================
+# TEST image array cache
+# =============================================================================
+
+class TestImageArrayCache:
+    """Tests for the arrays cached per image."""
+    
+    def test_hit_returns_same_array(self, pixel_art_8x8_scaled):
+        """Repeated calls on an unchanged image should reuse the array."""
+        first = _rgb_array(pixel_art_8x8_scaled)
+        assert _rgb_array(pixel_art_8x8_scaled) is first
+        assert not first.flags.writeable
+    
+    def test_freed_with_image(self):
+        """Cached arrays should not outlive their image."""
+        img = Image.new('RGB', (64, 64), (1, 2, 3))
+        ref = weakref.ref(_rgb_array(img))
+        del img
+        gc.collect()
+        assert ref() is None
+    
+    def test_invalidate(self, pixel_art_8x8_scaled):
+        """invalidate_image_cache should pick up any in-place edit."""
+        _rgb_array(pixel_art_8x8_scaled)
+        pixel_art_8x8_scaled.putpixel((0, 0), (1, 2, 3))
+        invalidate_image_cache(pixel_art_8x8_scaled)
+        assert _rgb_array(pixel_art_8x8_scaled)[0, 0].tolist() == [1, 2, 3]
+    
+    def test_copies_do_not_share(self, pixel_art_8x8_scaled):
+        """A copy of an image should get its own arrays."""
+        first = _rgb_array(pixel_art_8x8_scaled)
+        assert _rgb_array(pixel_art_8x8_scaled.copy()) is not first
+
+
 # =============================================================================
 # INTEGRATION TESTS
 # =============================================================================